@@ -1,39 +1,241 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import os
-import re
 import subprocess
-from typing import Any, Dict, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, Iterator, List, Optional, Tuple
+
+_JSON_DECODER = json.JSONDecoder()
+
+_COMPLEXITY_EMOJI: Dict[str, str] = {"simple": "🟢", "medium": "🟡", "complex": "🔴"}
+_CONFIDENCE_EMOJI: Dict[str, str] = {"high": "🎯", "medium": "📊", "low": "🤔"}
+
+
+def _extract_json_object(output: str) -> Optional[Dict[str, Any]]:
+    """Return the first JSON object embedded in free-form CLI output, if any"""
+    start = output.find("{")
+    while start != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(output, start)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = output.find("{", start + 1)
+    return None
+
+
+def _scandir_walk(root: str, prune: AbstractSet[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (relative_parent, name) for every non-hidden file under root.
+    relative_parent is "" or ends with "/". Hidden directories and any
+    directory named in prune are not descended into. Directories that cannot
+    be listed are skipped, as os.walk does.
+    """
+    pending = [(root, "")]
+    while pending:
+        current, rel_parent = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in prune:
+                        pending.append((entry.path, f"{rel_parent}{name}/"))
+                else:
+                    yield rel_parent, name
 
 
 class AICliInterface:
     # Timeout constants (in seconds)
     CLI_COMMAND_TIMEOUT = 30  # For Claude CLI API calls
 
+    # Parsed AI responses are reused across runs for identical prompts
+    RESPONSE_CACHE_DIR = (
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "toren"
+    )
+
+    # Directories never descended into when scanning a project
+    PRUNED_DIRECTORIES = frozenset(
+        {
+            ".git",
+            ".venv",
+            ".tox",
+            ".mypy_cache",
+            "venv",
+            "node_modules",
+            "__pycache__",
+            "target",
+            "build",
+            "dist",
+        }
+    )
+
+    # File types listed individually in the Dockerfile generation prompt
+    PROJECT_FILE_EXTENSIONS = frozenset(
+        {
+            ".py", ".js", ".ts", ".go", ".rs", ".java", ".rb", ".php",
+            ".txt", ".json", ".yaml", ".yml", ".toml", ".lock",
+        }
+    )
+
+    # BuildKit cache mounts for each language's package download cache
+    DEPENDENCY_CACHE_MOUNTS = {
+        "python": "--mount=type=cache,target=/root/.cache/pip",
+        "node": "--mount=type=cache,target=/root/.npm",
+        "rust": "--mount=type=cache,target=/usr/local/cargo/registry",
+        "go": "--mount=type=cache,target=/go/pkg/mod",
+        "java": "--mount=type=cache,target=/root/.m2",
+        "ruby": "--mount=type=cache,target=/usr/local/bundle/cache",
+        "php": "--mount=type=cache,target=/root/.composer/cache",
+    }
+
+    # Compiled languages get a builder stage and a slim runtime stage:
+    # language -> (builder image, runtime image, build artifact)
+    MULTISTAGE_IMAGES = {
+        "rust": (
+            "rust:1",
+            "debian:bookworm-slim",
+            "/workspace/target/release/<binary>",
+        ),
+        "go": (
+            "golang:1.22",
+            "gcr.io/distroless/static-debian12",
+            "/workspace/app",
+        ),
+        "java": (
+            "maven:3-eclipse-temurin-21",
+            "eclipse-temurin:21-jre",
+            "/workspace/target/*.jar",
+        ),
+    }
+
+    # Written as .dockerignore next to generated Dockerfiles so these never
+    # enter the build context
+    DOCKERIGNORE_ENTRIES = (
+        ".git",
+        ".venv",
+        "venv",
+        "__pycache__",
+        "*.pyc",
+        "node_modules",
+        "target",
+        "dist",
+        "build",
+        ".ai_agent",
+    )
+
+    # Root-level package manifests and the language they identify
+    PACKAGE_FILE_LANGUAGES = {
+        "requirements.txt": "python",
+        "pyproject.toml": "python",
+        "setup.py": "python",
+        "Pipfile": "python",
+        "package.json": "node",
+        "Cargo.toml": "rust",
+        "go.mod": "go",
+        "pom.xml": "java",
+        "build.gradle": "java",
+        "Gemfile": "ruby",
+        "composer.json": "php",
+    }
+
+    # Source file extensions and the language they count towards
+    EXTENSION_LANGUAGES = {
+        ".py": "python",
+        ".js": "node",
+        ".ts": "node",
+        ".rs": "rust",
+        ".go": "go",
+        ".java": "java",
+        ".rb": "ruby",
+        ".php": "php",
+    }
+
+    _CLI_CONFIGS = {
+        "claude": {
+            "command": "claude",
+            "api_key_env": "ANTHROPIC_API_KEY",
+            "model": "claude-3-5-sonnet",
+            "print_flag": "--print",
+        },
+        "gemini": {
+            "command": "gemini",
+            "api_key_env": "GEMINI_API_KEY",
+            "model": "gemini-2.5-flash",
+            "print_flag": "-p",
+        },
+        "codex": {
+            "command": "codex",
+            "api_key_env": "OPENAI_API_KEY",
+            "model": "gpt-5",
+            "print_flag": "exec",
+        },
+    }
+
     def __init__(self, cli_type: str = "claude"):
         self.cli_type = cli_type
-        self.cli_configs = {
-            "claude": {
-                "command": "claude",
-                "api_key_env": "ANTHROPIC_API_KEY",
-                "model": "claude-3-5-sonnet",
-                "print_flag": "--print",
-            },
-            "gemini": {
-                "command": "gemini",
-                "api_key_env": "GEMINI_API_KEY",
-                "model": os.environ.get("GEMINI_MODEL", "gemini-2.5-flash"),
-                "print_flag": "-p",
-            },
-            "codex": {
-                "command": "codex",
-                "api_key_env": "OPENAI_API_KEY",
-                "model": "gpt-5",
-                "print_flag": "exec",
-            },
-        }
-        self.config = self.cli_configs.get(cli_type, self.cli_configs["claude"])
+        self.config = dict(
+            self._CLI_CONFIGS.get(cli_type, self._CLI_CONFIGS["claude"])
+        )
+        if cli_type == "gemini":
+            self.config["model"] = os.environ.get("GEMINI_MODEL", self.config["model"])
+        self._project_scan_cache: Dict[str, Tuple[List[str], Counter]] = {}
+
+    def run_prompt(
+        self, prompt: str, timeout: Optional[int] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a single non-interactive prompt through the configured AI CLI.
+        stdin is closed so CLIs that also read piped input never wait on it.
+        Output is captured as bytes and decoded once.
+        """
+        result = subprocess.run(
+            [self.config["command"], self.config["print_flag"], prompt],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=timeout or self.CLI_COMMAND_TIMEOUT,
+        )
+        return subprocess.CompletedProcess(
+            result.args,
+            result.returncode,
+            result.stdout.decode("utf-8", "replace"),
+            result.stderr.decode("utf-8", "replace"),
+        )
+
+    def _response_cache_path(self, prompt: str) -> Path:
+        key = hashlib.blake2b(
+            f"{self.cli_type}\0{self.config['model']}\0{prompt}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return self.RESPONSE_CACHE_DIR / f"{key}.json"
+
+    def _load_cached_response(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Return a previously parsed response for this exact prompt, if cached"""
+        try:
+            data = json.loads(self._response_cache_path(prompt).read_text())
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _store_cached_response(self, prompt: str, data: Dict[str, Any]) -> None:
+        cache_path = self._response_cache_path(prompt)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(data))
+            temp_path.replace(cache_path)
+        except OSError:
+            pass
 
     def get_api_key(self) -> Optional[str]:
         api_key_env = self.config["api_key_env"]
@@ -99,25 +301,22 @@ Respond with a JSON object in this format:
     "confidence": "high|medium|low"
 }}"""
 
-            result = subprocess.run(
-                [self.config["command"], self.config["print_flag"], estimation_prompt],
-                capture_output=True,
-                text=True,
-                timeout=self.CLI_COMMAND_TIMEOUT,
-            )
+            cached = self._load_cached_response(estimation_prompt)
+            if cached is not None:
+                return cached
+
+            result = self.run_prompt(estimation_prompt)
 
             if result.returncode == 0:
                 output = result.stdout.strip()
 
-                json_match = re.search(r"\{[^}]+\}", output, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    estimate_data = json.loads(json_str)
-
+                estimate_data = _extract_json_object(output)
+                if estimate_data is not None:
                     estimate_data["language"] = language
                     estimate_data["model"] = self.config["model"]
                     estimate_data["raw_response"] = output
 
+                    self._store_cached_response(estimation_prompt, estimate_data)
                     return estimate_data
                 else:
                     return {
@@ -146,51 +345,60 @@ Respond with a JSON object in this format:
             print("❌ Cost estimation unavailable")
             return
 
-        print(f"\n💰 **{self.cli_type.title()}'s Cost Estimate for {task_type}**")
-        print("-" * 50)
+        lines = [
+            f"\n💰 **{self.cli_type.title()}'s Cost Estimate for {task_type}**",
+            "-" * 50,
+        ]
 
         if "complexity" in estimate:
-            complexity_emoji = {"simple": "🟢", "medium": "🟡", "complex": "🔴"}.get(
-                estimate["complexity"], "⚪"
+            complexity_emoji = _COMPLEXITY_EMOJI.get(estimate["complexity"], "⚪")
+            lines.append(
+                f"{complexity_emoji} Complexity: {estimate['complexity'].title()}"
             )
-            print(f"{complexity_emoji} Complexity: {estimate['complexity'].title()}")
 
         if "estimated_input_tokens" in estimate:
-            print(f"🔤 Est. Input Tokens: {estimate['estimated_input_tokens']:,}")
+            lines.append(
+                f"🔤 Est. Input Tokens: {estimate['estimated_input_tokens']:,}"
+            )
         if "estimated_output_tokens" in estimate:
-            print(f"📝 Est. Output Tokens: {estimate['estimated_output_tokens']:,}")
+            lines.append(
+                f"📝 Est. Output Tokens: {estimate['estimated_output_tokens']:,}"
+            )
 
         if "estimated_total_cost" in estimate:
-            print(f"💰 **Estimated Cost: ${estimate['estimated_total_cost']:.4f}**")
+            lines.append(
+                f"💰 **Estimated Cost: ${estimate['estimated_total_cost']:.4f}**"
+            )
 
         if "confidence" in estimate:
-            conf_emoji = {"high": "🎯", "medium": "📊", "low": "🤔"}.get(
-                estimate["confidence"], "❓"
+            conf_emoji = _CONFIDENCE_EMOJI.get(estimate["confidence"], "❓")
+            lines.append(
+                f"{conf_emoji} Confidence: {estimate['confidence'].title()}"
             )
-            print(f"{conf_emoji} Confidence: {estimate['confidence'].title()}")
 
-        print(f"🤖 Model: {estimate.get('model', self.config['model'])}")
-        print(f"🔧 Language: {estimate.get('language', 'unknown')}")
+        lines.append(f"🤖 Model: {estimate.get('model', self.config['model'])}")
+        lines.append(f"🔧 Language: {estimate.get('language', 'unknown')}")
 
         if "cost_factors" in estimate and estimate["cost_factors"]:
-            print("\n📋 **Cost Factors:**")
+            lines.append("\n📋 **Cost Factors:**")
             for factor in estimate["cost_factors"]:
-                print(f"  • {factor}")
+                lines.append(f"  • {factor}")
 
         if "cost_reduction_tips" in estimate and estimate["cost_reduction_tips"]:
-            print("\n💡 **Cost Reduction Tips:**")
+            lines.append("\n💡 **Cost Reduction Tips:**")
             for tip in estimate["cost_reduction_tips"]:
-                print(f"  • {tip}")
+                lines.append(f"  • {tip}")
 
         if "raw_response" in estimate:
-            print("\n🔍 **Raw Response Preview:**")
-            print(
+            lines.append("\n🔍 **Raw Response Preview:**")
+            lines.append(
                 estimate["raw_response"][:300] + "..."
                 if len(estimate["raw_response"]) > 300
                 else estimate["raw_response"]
             )
 
-        print()
+        lines.append("")
+        print("\n".join(lines))
 
     def check_short_description_quality(self, short_description: str) -> Dict[str, Any]:
         """
@@ -226,21 +434,19 @@ Respond with a JSON object in this format:
 Be strict - only mark as clear (true) if the description provides \
 enough detail for confident implementation."""
 
-            result = subprocess.run(
-                [self.config["command"], self.config["print_flag"], quality_prompt],
-                capture_output=True,
-                text=True,
-                timeout=self.CLI_COMMAND_TIMEOUT,
-            )
+            cached = self._load_cached_response(quality_prompt)
+            if cached is not None:
+                return cached
+
+            result = self.run_prompt(quality_prompt)
 
             if result.returncode == 0:
                 output = result.stdout.strip()
 
-                json_match = re.search(r"\{[^}]+\}", output, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    quality_data = json.loads(json_str)
+                quality_data = _extract_json_object(output)
+                if quality_data is not None:
                     quality_data["raw_response"] = output
+                    self._store_cached_response(quality_prompt, quality_data)
                     return quality_data
                 else:
                     # Fallback if JSON parsing fails
@@ -281,10 +487,29 @@ enough detail for confident implementation."""
                 "assessment": "Assessment error",
             }
 
+    def estimate_and_check(
+        self, task_content: str, short_description: str, language: str = "python"
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Run cost estimation and description quality check concurrently.
+        Both are independent CLI round-trips, so overlapping them roughly halves
+        the wall-clock time compared to calling them back-to-back.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            estimate_future = executor.submit(
+                self.estimate_task_cost, task_content, language
+            )
+            quality_future = executor.submit(
+                self.check_short_description_quality, short_description
+            )
+            return estimate_future.result(), quality_future.result()
+
     def print_quality_assessment(self, quality: Dict[str, Any]) -> None:
         """Print formatted quality assessment results"""
-        print("\n🔍 **Task Description Quality Assessment**")
-        print("-" * 50)
+        lines = [
+            "\n🔍 **Task Description Quality Assessment**",
+            "-" * 50,
+        ]
 
         if "clarity_score" in quality:
             score = quality["clarity_score"]
@@ -301,27 +526,112 @@ enough detail for confident implementation."""
                 score_emoji = "🔴"
                 score_desc = "Poor"
 
-            print(f"{score_emoji} Clarity Score: {score}/10 ({score_desc})")
+            lines.append(f"{score_emoji} Clarity Score: {score}/10 ({score_desc})")
 
         if "is_clear" in quality:
             clear_emoji = "✅" if quality["is_clear"] else "❌"
             clear_status = "Clear" if quality["is_clear"] else "Unclear"
-            print(f"{clear_emoji} Overall Assessment: {clear_status}")
+            lines.append(f"{clear_emoji} Overall Assessment: {clear_status}")
 
         if "assessment" in quality:
-            print(f"📝 Summary: {quality['assessment']}")
+            lines.append(f"📝 Summary: {quality['assessment']}")
 
         if "issues" in quality and quality["issues"]:
-            print("\n⚠️  **Issues Found:**")
+            lines.append("\n⚠️  **Issues Found:**")
             for issue in quality["issues"]:
-                print(f"  • {issue}")
+                lines.append(f"  • {issue}")
 
         if "recommendations" in quality and quality["recommendations"]:
-            print("\n💡 **Recommendations:**")
+            lines.append("\n💡 **Recommendations:**")
             for rec in quality["recommendations"]:
-                print(f"  • {rec}")
+                lines.append(f"  • {rec}")
+
+        lines.append("")
+        print("\n".join(lines))
+
+    def _multistage_template(
+        self, language: str, base_image: Optional[str] = None
+    ) -> Optional[str]:
+        """Return the multi-stage build outline for compiled languages, else None"""
+        images = self.MULTISTAGE_IMAGES.get(language)
+        if not images:
+            return None
+        builder_image, runtime_image, artifact = images
+        return f"""FROM {base_image or builder_image} AS builder
+WORKDIR /workspace
+# dependency manifests, cached dependency fetch, then source and build
+FROM {runtime_image}
+COPY --from=builder {artifact} /app/"""
+
+    def generate_dockerignore(self) -> str:
+        """Return .dockerignore content for generated Dockerfiles"""
+        return "\n".join(self.DOCKERIGNORE_ENTRIES) + "\n"
+
+    def _scan_project_tree(self, project_path: str) -> Tuple[List[str], Counter]:
+        """
+        Walk the project once with os.scandir, skipping hidden and build/cache
+        directories. Returns relevant relative file paths and a per-extension tally.
+        Results are cached per project root for the lifetime of the instance.
+        """
+        cache_key = os.path.realpath(project_path)
+        cached = self._project_scan_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        project_files: List[str] = []
+        extension_counts: Counter = Counter()
+        for rel_parent, name in _scandir_walk(project_path, self.PRUNED_DIRECTORIES):
+            ext = os.path.splitext(name)[1]
+            if not ext:
+                continue
+            extension_counts[ext] += 1
+            if ext in self.PROJECT_FILE_EXTENSIONS:
+                project_files.append(rel_parent + name)
+
+        project_files.sort()
+        self._project_scan_cache[cache_key] = (project_files, extension_counts)
+        return project_files, extension_counts
+
+    def _find_root_package_files(self, project_path: str) -> List[str]:
+        """Return the package manifests present at the project root, sorted by name"""
+        with os.scandir(project_path) as entries:
+            return sorted(
+                entry.name
+                for entry in entries
+                if entry.name in self.PACKAGE_FILE_LANGUAGES and entry.is_file()
+            )
+
+    def detect_project_language(self, project_path: str) -> str:
+        """
+        Detect the primary language of a project. Package manifests at the project
+        root decide on their own when they all point to one language; otherwise
+        manifests and source file counts across the tree are scored together.
+        """
+        try:
+            package_files = self._find_root_package_files(project_path)
+        except OSError:
+            return "unknown"
+        manifest_languages = Counter(
+            self.PACKAGE_FILE_LANGUAGES[name] for name in package_files
+        )
 
-        print()
+        if len(manifest_languages) == 1:
+            return next(iter(manifest_languages))
+
+        try:
+            _, extension_counts = self._scan_project_tree(project_path)
+        except OSError:
+            extension_counts = Counter()
+
+        scores: Counter = Counter()
+        for language, count in manifest_languages.items():
+            scores[language] = count * 10
+        for ext, count in extension_counts.items():
+            ext_language = self.EXTENSION_LANGUAGES.get(ext)
+            if ext_language:
+                scores[ext_language] += count
+
+        return scores.most_common(1)[0][0] if scores else "unknown"
 
     def generate_dockerfile(
         self, project_path: str, base_image: Optional[str] = None
@@ -334,22 +644,46 @@ enough detail for confident implementation."""
             print("🐳 Generating Dockerfile using AI analysis...")
             
             # Analyze project structure
-            project_files = []
             try:
-                for root, dirs, files in os.walk(project_path):
-                    # Skip hidden directories and common build/cache directories
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'target', 'build', 'dist']]
-                    
-                    for file in files:
-                        if not file.startswith('.') and file.endswith(('.py', '.js', '.ts', '.go', '.rs', '.java', '.rb', '.php', '.txt', '.json', '.yaml', '.yml', '.toml', '.lock')):
-                            rel_path = os.path.relpath(os.path.join(root, file), project_path)
-                            project_files.append(rel_path)
-                
+                project_files, extension_counts = self._scan_project_tree(project_path)
                 # Limit to first 30 files to avoid token limits
                 project_files = project_files[:30]
-            except Exception as e:
+            except OSError as e:
                 print(f"⚠️  Warning: Could not analyze project structure: {e}")
-                project_files = []
+                project_files, extension_counts = [], Counter()
+
+            language = self.detect_project_language(project_path)
+            try:
+                package_files = self._find_root_package_files(project_path)
+            except OSError:
+                package_files = []
+            if package_files:
+                dependency_instruction = (
+                    f"Copy the dependency manifests in ONE instruction "
+                    f"(COPY {' '.join(package_files)} ./) and install all "
+                    f"dependencies in ONE RUN chained with &&"
+                )
+            else:
+                dependency_instruction = (
+                    "Install application dependencies in a single RUN chained with &&"
+                )
+            cache_mount = self.DEPENDENCY_CACHE_MOUNTS.get(language)
+            if cache_mount:
+                dependency_instruction += (
+                    f", using a BuildKit cache mount (RUN {cache_mount} ...) and "
+                    f"starting the file with '# syntax=docker/dockerfile:1.7'"
+                )
+            file_type_summary = ", ".join(
+                f"{ext}: {count}" for ext, count in extension_counts.most_common(10)
+            )
+
+            multistage_outline = self._multistage_template(language, base_image)
+            if multistage_outline:
+                build_stage_instruction = f"""Use a multi-stage build so the final \
+image ships only the build output, not the {language} toolchain. Follow this outline:
+{multistage_outline}"""
+            else:
+                build_stage_instruction = "Use a single build stage"
 
             # Create prompt for Dockerfile generation
             base_image_instruction = f"Use '{base_image}' as the base image." if base_image else "Select an appropriate base image based on the project type."
@@ -359,41 +693,44 @@ enough detail for confident implementation."""
 PROJECT FILES:
 {chr(10).join(project_files) if project_files else "No files found - generate a basic Dockerfile"}
 
+FILE TYPE COUNTS (whole project):
+{file_type_summary or "None"}
+
+DETECTED PRIMARY LANGUAGE: {language}
+
 REQUIREMENTS:
 1. {base_image_instruction}
-2. Detect the primary language/framework from the files
-3. Install necessary system dependencies
-4. Copy application files efficiently
-5. Set appropriate working directory
-6. Install application dependencies (requirements.txt, package.json, Cargo.toml, etc.)
+2. Confirm the primary language/framework from the files
+3. Install necessary system dependencies first, before WORKDIR and any COPY
+4. Set appropriate working directory
+5. {dependency_instruction}
+6. Only after dependencies are installed, copy the rest of the source (COPY . .)
 7. Expose relevant ports if it's a web application
 8. Set proper entrypoint/command
 9. Follow Docker best practices (layer caching, minimize layers, non-root user if applicable)
 10. Add health checks if appropriate
+11. {build_stage_instruction}
+12. Do not add RUN steps that delete files (e.g. find ... -exec rm); a .dockerignore \
+already excludes {", ".join(self.DOCKERIGNORE_ENTRIES)}
 
 Generate a production-ready Dockerfile with comments explaining each section.
 Respond with ONLY the Dockerfile content - no additional text or explanations."""
 
-            result = subprocess.run(
-                [self.config["command"], self.config["print_flag"], dockerfile_prompt],
-                capture_output=True,
-                text=True,
-                timeout=self.CLI_COMMAND_TIMEOUT,
-            )
+            result = self.run_prompt(dockerfile_prompt)
 
             if result.returncode == 0:
                 dockerfile_content = result.stdout.strip()
                 
                 # Clean up the response - remove any markdown code blocks or extra text
                 if dockerfile_content.startswith("```"):
-                    lines = dockerfile_content.split('\n')
-                    start_idx = 1 if lines[0].startswith("```") else 0
-                    end_idx = len(lines)
-                    for i in range(len(lines)-1, -1, -1):
-                        if lines[i].strip() == "```":
-                            end_idx = i
-                            break
-                    dockerfile_content = '\n'.join(lines[start_idx:end_idx])
+                    body_start = dockerfile_content.find("\n") + 1
+                    body_end = dockerfile_content.rfind("```", body_start)
+                    if body_start == 0:
+                        dockerfile_content = ""
+                    elif body_end == -1:
+                        dockerfile_content = dockerfile_content[body_start:]
+                    else:
+                        dockerfile_content = dockerfile_content[body_start:body_end]
                 
                 return dockerfile_content.strip()
             else:
@@ -455,12 +792,7 @@ Be very succint. no more than 3 paragraphs of details. Use 1-2 lines when possib
 Be more lenient with minor changes and PR Approval since you might not have full context.
 Provide constructive feedback that helps improve the code. Be specific about line numbers or functions when possible."""
 
-            result = subprocess.run(
-                [self.config["command"], self.config["print_flag"], review_prompt],
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
+            result = self.run_prompt(review_prompt, timeout=300)
 
             if result.returncode == 0:
                 review_content = result.stdout.strip()
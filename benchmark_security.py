@@ -3,82 +3,404 @@
 Benchmark script for Claude Agent security scanning performance
 """
 
+import functools
+import hashlib
+import importlib.metadata
+import json
+import mmap
 import os
+import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Timeout constants (in seconds)
 SECURITY_SCAN_TIMEOUT = 30  # For security scanning operations
+GIT_DIFF_TIMEOUT = 10
+
+# Set TOREN_INCREMENTAL=1 to scan only files changed since INCREMENTAL_BASE
+# and reuse per-file bandit results for content that was already scanned
+INCREMENTAL_BASE = os.environ.get("TOREN_INCREMENTAL_BASE", "HEAD~1")
+BANDIT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "toren" / "bandit"
+)
+
+# Medium severity and above; the in-process manager applies the same filter
+BANDIT_ARGS = ["-ll", "-f", "json"]
+
+
+# Files up to this size are read with a single exact-size read
+SINGLE_READ_LIMIT = 8 << 20
+
+
+def _count_lines(path):
+    """
+    Count lines in a file by scanning its raw bytes. A last line without a
+    trailing newline still counts, matching len(readlines()).
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return 0
+        if size <= SINGLE_READ_LIMIT:
+            data = os.read(fd, size)
+            return data.count(b"\n") + (data[-1:] != b"\n")
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mapped:
+            newlines = sum(
+                chunk.count(b"\n") for chunk in iter(lambda: mapped.read(1 << 20), b"")
+            )
+            return newlines + (mapped[size - 1 : size] != b"\n")
+    finally:
+        os.close(fd)
+
+
+def _safe_count_lines(path):
+    try:
+        return _count_lines(path)
+    except OSError:
+        return 0
 
 
 def count_python_files():
-    """Count Python files and lines in current directory"""
-    py_files = list(Path(".").glob("*.py"))
-    total_lines = 0
+    """
+    Count Python files and lines in current directory. Returns
+    (file_count, total_lines, {file_name: line_count}).
+    """
+    return _count_python_files_cached(os.getcwd(), os.stat(".").st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _count_python_files_cached(cwd, dir_mtime_ns):
+    """
+    Memoized per directory and directory mtime, which changes when files are
+    added, removed or renamed. In-place edits to existing files do not bump it,
+    so line totals can lag behind edits made during the same process.
+    """
+    with os.scandir(cwd) as entries:
+        py_files = [
+            entry
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file(follow_symlinks=False)
+        ]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        counts = executor.map(_safe_count_lines, [entry.path for entry in py_files])
+        per_file = {entry.name: count for entry, count in zip(py_files, counts)}
+
+    return len(py_files), sum(per_file.values()), per_file
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_in_process():
+    """Return (BanditConfig, manager module) when bandit is importable, else None"""
+    try:
+        from bandit.core import config as bandit_config
+        from bandit.core import manager as bandit_manager
+    except ImportError:
+        return None
+    return bandit_config.BanditConfig(), bandit_manager
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_available():
+    """Check once per run whether bandit can be run in-process or as a CLI"""
+    if _bandit_in_process() is not None:
+        return True
+    executable = _bandit_executable()
+    if executable is None:
+        return False
+    try:
+        subprocess.run([executable, "--version"], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, OSError):
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_executable():
+    """Absolute path to the bandit CLI, or None when it is not on PATH"""
+    return shutil.which("bandit")
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_version():
+    """Installed bandit version, or an empty string when it cannot be found"""
+    try:
+        return importlib.metadata.version("bandit")
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    executable = _bandit_executable()
+    if executable is None:
+        return ""
+    try:
+        result = subprocess.run(
+            [executable, "--version"], capture_output=True, text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout.split("\n", 1)[0].strip()
+
+
+@functools.lru_cache(maxsize=4)
+def _changed_files(base=INCREMENTAL_BASE):
+    """Files changed between base and the working tree, per git diff"""
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", base],
+            capture_output=True,
+            text=True,
+            timeout=GIT_DIFF_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return frozenset(result.stdout.splitlines())
+
+
+def _bandit_cache_path(path):
+    """Cache entry keyed by the file's content, the bandit version and flags"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{_bandit_version()} {' '.join(BANDIT_ARGS)}\0".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return BANDIT_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+
+def _matching_files(reported_paths, files):
+    """The entries of files that bandit reported, in whatever form it used"""
+    by_normalized_path = {os.path.normpath(path): path for path in files}
+    return {
+        by_normalized_path[normalized]
+        for normalized in map(os.path.normpath, reported_paths)
+        if normalized in by_normalized_path
+    }
+
+
+def _group_bandit_results(issues, files):
+    """Split bandit issue dicts into a findings list per scanned file"""
+    findings = {path: [] for path in files}
+    # bandit reports discovered paths in its own form (e.g. "./toren.py")
+    by_normalized_path = {os.path.normpath(path): path for path in files}
+    for issue in issues:
+        path = by_normalized_path.get(os.path.normpath(issue.get("filename", "")))
+        if path is not None:
+            findings[path].append(issue)
+    return findings
+
+
+def _run_bandit_cli(files, keep_report):
+    """
+    Run the bandit CLI over files and return (issues, failed): its issue dicts
+    and the files it could not scan. Both are empty without keep_report.
+    """
+    # An absolute executable, redirected stdio and close_fds=False let
+    # subprocess launch bandit with posix_spawn instead of fork+exec
+    result = subprocess.run(
+        [_bandit_executable()] + BANDIT_ARGS + files,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE if keep_report else subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,
+        timeout=SECURITY_SCAN_TIMEOUT,
+    )
+    if not keep_report:
+        return [], set()
+    try:
+        report = json.loads(result.stdout)
+    except ValueError:
+        # No report at all (bandit crashed), so no file counts as scanned
+        return [], set(files)
+    errors = report.get("errors", [])
+    failed = _matching_files((error.get("filename", "") for error in errors), files)
+    return report.get("results", []), failed
+
+
+def _bandit_jobs():
+    """Number of concurrent bandit CLI processes a scan is split across"""
+    value = os.environ.get("TOREN_BANDIT_JOBS", "1")
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print(f"⚠️  Ignoring invalid TOREN_BANDIT_JOBS={value!r}, using 1")
+        return 1
+
+
+def _timed_bandit_cli(files, keep_report):
+    """Run _run_bandit_cli and return (issues, failed, seconds spent)"""
+    start_ns = time.perf_counter_ns()
+    issues, failed = _run_bandit_cli(files, keep_report)
+    return issues, failed, (time.perf_counter_ns() - start_ns) / 1e9
+
 
-    for file in py_files:
-        try:
-            with open(file, "r", encoding="utf-8") as f:
-                total_lines += len(f.readlines())
-        except (OSError, UnicodeDecodeError, PermissionError):
-            pass
+def _run_bandit(files, keep_report):
+    """
+    Scan files with bandit at medium severity and above (-ll). With
+    TOREN_BANDIT_JOBS > 1, files are split across that many concurrent CLI
+    processes. Otherwise bandit's manager runs in-process when importable,
+    which skips interpreter startup and plugin loading per scan, and the CLI
+    is the fallback. Timings are only comparable between runs that used the
+    same engine. Returns (issues, failed, engine, chunk_times): issue dicts, or
+    an empty list when keep_report is False and the CLI is used, the files
+    bandit could not scan, a label for the engine that ran, and the per-chunk
+    scan times when the scan was split (otherwise an empty list).
+    """
+    jobs = min(_bandit_jobs(), len(files))
+    if jobs > 1 and _bandit_executable() is not None:
+        chunks = [files[i::jobs] for i in range(jobs)]
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(
+                    lambda chunk: _timed_bandit_cli(chunk, keep_report), chunks
+                )
+            )
+        issues = [issue for chunk_issues, _, _ in results for issue in chunk_issues]
+        failed = set().union(*(chunk_failed for _, chunk_failed, _ in results))
+        chunk_times = [chunk_time for _, _, chunk_time in results]
+        return issues, failed, f"CLI x{jobs}", chunk_times
 
-    return len(py_files), total_lines
+    bandit_api = _bandit_in_process()
+    if bandit_api is not None:
+        config, bandit_manager = bandit_api
+        manager = bandit_manager.BanditManager(config, "file", quiet=True)
+        manager.discover_files(files)
+        manager.run_tests()
+        issues = [
+            issue.as_dict(with_code=False)
+            for issue in manager.get_issue_list(sev_level="MEDIUM", conf_level="LOW")
+        ]
+        # skipped holds (path, reason) for files that could not be read or parsed
+        failed = _matching_files((path for path, _ in manager.skipped), files)
+        return issues, failed, "in-process", []
 
+    issues, failed = _run_bandit_cli(files, keep_report)
+    return issues, failed, "CLI", []
 
-def simulate_bandit_scan(files_to_scan=None):
-    """Simulate bandit performance on given files"""
+
+def _store_bandit_results(findings, cache_paths):
+    try:
+        BANDIT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for path, issues in findings.items():
+            cache_paths[path].write_text(json.dumps(issues))
+    except OSError:
+        pass
+
+
+def simulate_bandit_scan(
+    files_to_scan=None, findings=None, existing=None, line_counts=None
+):
+    """
+    Simulate bandit performance on given files. When a findings dict is
+    passed, it is filled with the bandit issues reported for each file.
+    A precomputed set of existing paths skips the per-file exists() checks,
+    and known line counts (from count_python_files) avoid re-reading files.
+    Returns (scan_time, bytes_scanned, details).
+    """
+    if line_counts is None:
+        line_counts = {}
     if files_to_scan is None:
         files_to_scan = ["toren.py", "github_utils.py", "job_manager.py"]
+    collect_findings = findings is not None
+    if findings is None:
+        findings = {}
 
     # Filter files that actually exist
-    existing_files = [f for f in files_to_scan if os.path.exists(f)]
+    if existing is None:
+        existing_files = [f for f in files_to_scan if os.path.exists(f)]
+    else:
+        existing_files = [f for f in files_to_scan if f in existing]
     if not existing_files:
-        return 0, "No files to scan"
+        return 0, 0, "No files to scan"
 
-    # Check if bandit is available
-    try:
-        subprocess.run(["bandit", "--version"], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return 0, "Bandit not installed"
+    cache_paths = {}
+    cached_count = 0
+    if os.environ.get("TOREN_INCREMENTAL") == "1":
+        changed = _changed_files()
+        if changed is not None:
+            existing_files = [f for f in existing_files if f in changed]
+            if not existing_files:
+                return 0, 0, f"No changes since {INCREMENTAL_BASE} - scan skipped"
+
+        cache_paths = {f: _bandit_cache_path(f) for f in existing_files}
+        misses = []
+        for f in existing_files:
+            try:
+                findings[f] = json.loads(cache_paths[f].read_text())
+            except (OSError, ValueError):
+                misses.append(f)
+        cached_count = len(existing_files) - len(misses)
+        existing_files = misses
+        if not existing_files:
+            # findings already holds the cached results for every file
+            return (
+                0,
+                0,
+                f"All {cached_count} files unchanged since last scan - skipped",
+            )
+
+    if not _bandit_available():
+        return 0, 0, "Bandit not installed (pip install -e '.[security]')"
 
     # Time the scan
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     try:
-        subprocess.run(
-            ["bandit", "-ll", "-f", "json"] + existing_files,
-            capture_output=True,
-            text=True,
-            timeout=SECURITY_SCAN_TIMEOUT,
+        # Only keep bandit's JSON report when something will read it
+        keep_report = collect_findings or bool(cache_paths)
+        issues, failed, engine, chunk_times = _run_bandit(
+            existing_files, keep_report
         )
-        end_time = time.time()
-        scan_time = end_time - start_time
+        # Wall-clock time; with concurrent chunks this tracks the slowest one
+        scan_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+        if keep_report:
+            scanned = _group_bandit_results(issues, existing_files)
+            findings.update(scanned)
+            if cache_paths:
+                # Files bandit could not scan have no findings, not clean ones
+                _store_bandit_results(
+                    {f: scanned[f] for f in scanned if f not in failed}, cache_paths
+                )
 
-        # Count lines scanned
-        total_lines = 0
-        for file in existing_files:
-            with open(file, "r") as f:
-                total_lines += len(f.readlines())
+        # Count lines and bytes scanned
+        total_lines = sum(
+            line_counts[file] if file in line_counts else _count_lines(file)
+            for file in existing_files
+        )
+        bytes_scanned = sum(os.path.getsize(file) for file in existing_files)
 
-        return scan_time, f"Scanned {len(existing_files)} files ({total_lines} lines)"
+        details = (
+            f"Scanned {len(existing_files)} files ({total_lines} lines), "
+            f"bandit {engine}"
+        )
+        if cached_count:
+            details += f", {cached_count} cached"
+        if failed:
+            details += f", {len(failed)} not parseable"
+        if chunk_times:
+            work_time = sum(chunk_times)
+            details += f", work_time {work_time:.2f}s over {len(chunk_times)} jobs"
+        return scan_time, bytes_scanned, details
 
     except subprocess.TimeoutExpired:
-        return 30, "Scan timed out"
+        return SECURITY_SCAN_TIMEOUT, 0, "Scan timed out"
     except Exception as e:
-        return 0, f"Error: {e}"
+        return 0, 0, f"Error: {e}"
 
 
 def main():
-    print("🚀 Claude Agent Security Performance Benchmark")
-    print("=" * 50)
+    lines = [
+        "🚀 Claude Agent Security Performance Benchmark",
+        "=" * 50,
+    ]
 
     # Analyze current codebase
-    py_files, total_lines = count_python_files()
-    print("📊 Codebase Analysis:")
-    print(f"   Python files: {py_files}")
-    print(f"   Total lines: {total_lines}")
-    print()
+    py_files, total_lines, per_file_lines = count_python_files()
+    lines.append("📊 Codebase Analysis:")
+    lines.append(f"   Python files: {py_files}")
+    lines.append(f"   Total lines: {total_lines}")
+    lines.append("")
 
     # Test different scenarios
     scenarios = [
@@ -90,26 +412,59 @@ def main():
         ),
     ]
 
-    print("⏱️  Performance Tests:")
-    print("-" * 30)
+    lines.append("⏱️  Performance Tests:")
+    lines.append("-" * 30)
+
+    # Scenarios overlap, so bandit runs once over their union and each
+    # scenario is attributed a line-weighted share of that scan time
+    union = sorted({f for _, files in scenarios for f in files})
+    existing = {f for f in union if os.path.exists(f)}
+    findings = {}
+    scan_time, bytes_scanned, details = simulate_bandit_scan(
+        union, findings, existing, per_file_lines
+    )
+    # A timed-out scan reports the timeout as its time but scans no bytes, so
+    # there is nothing to derive throughput or scenario times from
+    measured = scan_time > 0 and bytes_scanned > 0
+    # Every file was a cache hit: no timing, but the findings still count
+    cached_only = scan_time == 0 and bool(findings)
+    if measured:
+        throughput = bytes_scanned / scan_time / 1e6
+        lines.append(
+            f"   {'All scenarios':<20}: {scan_time:.2f}s, "
+            f"{throughput:.2f} MB/s ({details})"
+        )
+    elif cached_only:
+        lines.append(f"   {'All scenarios':<20}: {details}")
 
-    for scenario_name, files in scenarios:
-        scan_time, details = simulate_bandit_scan(files)
-        if scan_time > 0:
-            print(f"   {scenario_name:<20}: {scan_time:.2f}s ({details})")
-        else:
-            print(f"   {scenario_name:<20}: {details}")
+    if measured or cached_only:
+        line_counts = {
+            f: per_file_lines[f] if f in per_file_lines else _safe_count_lines(f)
+            for f in existing
+        }
+        union_lines = sum(line_counts.values()) or 1
+        for scenario_name, files in scenarios:
+            scenario_lines = sum(line_counts.get(f, 0) for f in files)
+            issues = sum(len(findings.get(f, [])) for f in files)
+            share = scan_time * scenario_lines / union_lines
+            lines.append(
+                f"   {scenario_name:<20}: ~{share:.2f}s "
+                f"({scenario_lines} lines, {issues} issues)"
+            )
+    else:
+        for scenario_name, _ in scenarios:
+            lines.append(f"   {scenario_name:<20}: {details}")
 
-    print()
-    print("📈 Performance Characteristics:")
-    print("   • Git diff scanning scales linearly with changed code")
-    print("   • Typical pre-commit delay: 0.5-3 seconds")
-    print("   • Only scans files you're actually changing")
-    print("   • Much faster than full codebase scanning")
-    print()
+    lines.append("")
+    lines.append("📈 Performance Characteristics:")
+    lines.append("   • Git diff scanning scales linearly with changed code")
+    lines.append("   • Typical pre-commit delay: 0.5-3 seconds")
+    lines.append("   • Only scans files you're actually changing")
+    lines.append("   • Much faster than full codebase scanning")
+    lines.append("")
 
     # Estimate Docker scanning
-    print("🐳 Docker Security Scanning (for comparison):")
+    lines.append("🐳 Docker Security Scanning (for comparison):")
     docker_estimates = [
         ("python:3.11-slim", "30-60 seconds"),
         ("python:3.11", "1-3 minutes"),
@@ -118,10 +473,15 @@ def main():
     ]
 
     for image, time_estimate in docker_estimates:
-        print(f"   {image:<20}: {time_estimate}")
+        lines.append(f"   {image:<20}: {time_estimate}")
+
+    lines.append("")
+    lines.append(
+        "💡 Recommendation: Git pre-commit hooks have minimal performance impact!"
+    )
 
-    print()
-    print("💡 Recommendation: Git pre-commit hooks have minimal performance impact!")
+    # Written in one go so the report is not interleaved with other output
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -4,7 +4,16 @@ CLI Parser - Handles command line argument parsing for Claude Agent
 """
 
 import argparse
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+
+def _log_tail(value: str) -> str:
+    """argparse type for `logs --tail`: a line count or 'all'"""
+    if value == "all" or (value.isascii() and value.isdigit()):
+        return value
+    raise argparse.ArgumentTypeError(
+        f"invalid line count: {value!r} (use a number or 'all')"
+    )
 
 
 class CLIParser:
@@ -13,11 +22,19 @@ class CLIParser:
     def __init__(self, reviewer_username: str, config: Dict[str, Any]):
         self.reviewer_username = reviewer_username
         self.config = config
-        self._parser = None
+        self._parser: Optional[argparse.ArgumentParser] = None
 
     def parse_args(self) -> argparse.Namespace:
         """Parse command line arguments"""
-        self._parser = argparse.ArgumentParser(
+        return self.build_parser().parse_args()
+
+    def print_help(self) -> None:
+        """Print top-level help, building the parser only if needed"""
+        (self._parser or self.build_parser()).print_help()
+
+    def build_parser(self) -> argparse.ArgumentParser:
+        """Build the top-level parser with all subcommands"""
+        parser = argparse.ArgumentParser(
             description="Toren - Multi-AI CLI Agent Runner",
             epilog="""Common workflows:
   Health check:   toren health --docker-image python:3.11 --security
@@ -33,7 +50,7 @@ class CLIParser:
 Visit https://github.com/vikranth22446/toren for more information.""",
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
-        subparsers = self._parser.add_subparsers(dest="command", help="Available commands")
+        subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
         self._add_run_parser(subparsers)
         self._add_review_parser(subparsers)
@@ -46,7 +63,8 @@ Visit https://github.com/vikranth22446/toren for more information.""",
         self._add_update_parser(subparsers)
         self._add_gen_dockerfile_parser(subparsers)
 
-        return self._parser.parse_args()
+        self._parser = parser
+        return parser
 
     def _add_run_parser(self, subparsers):
         """Add run command parser"""
@@ -202,7 +220,8 @@ Visit https://github.com/vikranth22446/toren for more information.""",
             description="Display Docker container logs for a running or completed job.",
             epilog="""Examples:
   %(prog)s abc123              # Show logs for job abc123
-  %(prog)s abc123 --follow     # Follow logs in real-time (like tail -f)""",
+  %(prog)s abc123 --follow     # Follow logs in real-time (like tail -f)
+  %(prog)s abc123 --tail all   # Show the complete log""",
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
         logs_parser.add_argument(
@@ -214,6 +233,14 @@ Visit https://github.com/vikranth22446/toren for more information.""",
             action="store_true",
             help="Follow log output in real-time (like tail -f)",
         )
+        logs_parser.add_argument(
+            "--tail",
+            "-n",
+            default="500",
+            type=_log_tail,
+            metavar="LINES",
+            help="Number of lines to show from the end of the logs, or 'all' (default: 500)",
+        )
 
     def _add_cleanup_parser(self, subparsers):
         """Add cleanup command parser"""
@@ -333,6 +360,11 @@ Visit https://github.com/vikranth22446/toren for more information.""",
             default="./Dockerfile",
             help="Output file path for generated Dockerfile (default: ./Dockerfile)",
         )
+        gen_dockerfile_parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Overwrite an existing output file without prompting",
+        )
 
     def _add_review_parser(self, subparsers):
         """Add review command parser"""
@@ -133,26 +133,22 @@ Use /tmp/claude_docs/ for analysis. Working dir: /workspace."""
             # Get issue/PR context from environment
             issue_number = os.environ.get("GITHUB_ISSUE_NUMBER")
             pr_number = os.environ.get("PR_NUMBER")
-            
+
+            # github_utils is on PYTHONPATH in the container; call it in-process
+            from github_utils import GitHubUtils
+            github = GitHubUtils()
+
             if pr_number:
                 # Get PR title for task name
-                result = subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "get-pr", pr_number
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    import json
-                    pr_data = json.loads(result.stdout)
+                pr_data = github.get_pr(pr_number)
+                if pr_data:
                     task_title = pr_data.get("title", "Continue PR work")
                 else:
                     task_title = f"Continue PR #{pr_number}"
             elif issue_number:
                 # Get issue title for task name
-                result = subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "get-issue", issue_number
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    import json
-                    issue_data = json.loads(result.stdout)
+                issue_data = github.get_issue(issue_number)
+                if issue_data:
                     task_title = issue_data.get("title", f"Issue #{issue_number}")
                 else:
                     task_title = f"Issue #{issue_number}"
@@ -167,13 +163,9 @@ Use /tmp/claude_docs/ for analysis. Working dir: /workspace."""
             
             # Post to appropriate target
             if pr_number:
-                subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "comment-pr", pr_number, started_msg
-                ], check=False)
+                github.comment_pr(pr_number, started_msg)
             elif issue_number:
-                subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "comment-issue", issue_number, started_msg
-                ], check=False)
+                github.comment_issue(issue_number, started_msg)
             else:
                 print(f"📢 {started_msg}", flush=True)
                 
@@ -190,7 +182,7 @@ Use /tmp/claude_docs/ for analysis. Working dir: /workspace."""
                         first_line = f.readline().strip()
                         return first_line.lstrip('#').strip()[:100]
                 except:
-                    return task_spec.split('/')[-1]
+                    return task_spec.rpartition('/')[2]
             else:
                 # Extract first meaningful line from text
                 lines = task_spec.strip().split('\n')
@@ -254,25 +246,25 @@ Use /tmp/claude_docs/ for analysis. Working dir: /workspace."""
             pr_number = os.environ.get("PR_NUMBER")
             reviewer = os.environ.get('DEFAULT_REVIEWER', 'vikranth22446')
             
+            from github_utils import GitHubUtils
             from message_templates import MessageTemplates
+            github = GitHubUtils(reviewer)
             
             if exit_code == 0:
                 # Success - check if PR was created by looking at git log
                 try:
                     # Get recent commits to estimate lines changed
                     result = subprocess.run([
-                        "git", "log", "--oneline", "-1", "--stat"
+                        "git", "show", "--numstat", "--format=", "HEAD"
                     ], capture_output=True, text=True, cwd="/workspace")
                     
                     lines_changed = 0
                     if result.returncode == 0:
-                        # Parse git stat output for line changes
-                        stat_lines = result.stdout.split('\n')
-                        for line in stat_lines:
-                            if 'insertions' in line or 'deletions' in line:
-                                import re
-                                numbers = re.findall(r'(\d+)', line)
-                                lines_changed += sum(int(n) for n in numbers)
+                        # numstat lines are "added<TAB>deleted<TAB>path" ("-" for binary)
+                        for line in result.stdout.splitlines():
+                            added, deleted, _ = line.split('\t', 2)
+                            if added.isdigit() and deleted.isdigit():
+                                lines_changed += int(added) + int(deleted)
                     
                     # Try to find if PR was created (look for PR number in recent commits)
                     created_pr_number = pr_number  # Use existing PR or will be set if new one created
@@ -302,13 +294,9 @@ Use /tmp/claude_docs/ for analysis. Working dir: /workspace."""
             
             # Post to appropriate target
             if pr_number:
-                subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "comment-pr", pr_number, completed_msg
-                ], check=False)
+                github.comment_pr(pr_number, completed_msg)
             elif issue_number:
-                subprocess.run([
-                    "python", "/usr/local/bin/github_utils.py", "comment-issue", issue_number, completed_msg
-                ], check=False)
+                github.comment_issue(issue_number, completed_msg)
             else:
                 print(f"📢 {completed_msg}", flush=True)
                 
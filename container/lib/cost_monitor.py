@@ -5,7 +5,6 @@ Cost monitoring and session tracking module
 
 import argparse
 import json
-import re
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
@@ -73,29 +72,22 @@ class CostMonitor:
             return git_stats
 
         try:
-            # Get diff stats
+            # numstat emits "added<TAB>deleted<TAB>path" per file ("-" for binary)
             result = subprocess.run(
-                ["git", "diff", "--stat", f"{starting_commit}..HEAD"],
+                ["git", "diff", "--numstat", f"{starting_commit}..HEAD"],
                 capture_output=True,
                 text=True,
                 check=False,
             )
 
-            if result.returncode == 0 and result.stdout.strip():
-                summary_line = result.stdout.strip().split("\n")[-1]
-
-                # Parse stats
-                insertion_match = re.search(r"(\d+) insertion", summary_line)
-                if insertion_match:
-                    git_stats["lines_added"] = int(insertion_match.group(1))
-
-                deletion_match = re.search(r"(\d+) deletion", summary_line)
-                if deletion_match:
-                    git_stats["lines_deleted"] = int(deletion_match.group(1))
-
-                files_match = re.search(r"(\d+) file", summary_line)
-                if files_match:
-                    git_stats["files_changed"] = int(files_match.group(1))
+            if result.returncode == 0:
+                for line in result.stdout.splitlines():
+                    added, deleted, _ = line.split("\t", 2)
+                    git_stats["files_changed"] += 1
+                    if added.isdigit():
+                        git_stats["lines_added"] += int(added)
+                    if deleted.isdigit():
+                        git_stats["lines_deleted"] += int(deleted)
 
                 git_stats["total_lines_changed"] = (
                     git_stats["lines_added"] + git_stats["lines_deleted"]
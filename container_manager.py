@@ -3,59 +3,36 @@
 import fcntl
 import hashlib
 import os
+import re
 import shlex
+import shutil
 import subprocess
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
+# Bundled build-context files (container/, helpers) live beside this module
+_PACKAGE_DIR = Path(__file__).resolve().parent
 
-class ContainerManager:
-    # Timeout constants (in seconds)
-    DOCKER_BUILD_TIMEOUT = 300  # 5 minutes for Docker builds
-
-    def __init__(self, validator=None):
-        self.validator = validator
-
-    def _is_safe_env_var(self, env_var: str) -> bool:
-        """Basic safety check for environment variables when no validator is available"""
-        if not env_var or "=" not in env_var:
-            return False
+# Portable environment variable name; keys are checked before values
+_ENV_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
-        # Check for command injection patterns
-        dangerous_patterns = [";", "`", "$", "\n", "$(", "${", "|", "&", "\\"]
-        return not any(pattern in env_var for pattern in dangerous_patterns)
+# host:container[:options]; host may carry a Windows drive letter (C:\data)
+_VOLUME_SPEC_RE = re.compile(
+    r"(?P<host>[A-Za-z]:[\\/][^:]*|[^:]+)"
+    r":(?P<container>/[^:]*)"
+    r"(?::(?P<options>[A-Za-z,]+))?"
+)
 
-    def _is_safe_input(self, input_str: str) -> bool:
-        """Basic safety check for general inputs"""
-        if not input_str:
-            return False
+# RAM-backed tmpfs for files holding secrets; None uses the default temp dir
+_SECRET_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
-        # No dangerous characters that could break shell/docker commands
-        dangerous_chars = [";", "`", "$", "\n", "\r", "|", "&", ">", "<"]
-        return not any(char in input_str for char in dangerous_chars)
-
-    def _get_cli_install_section(self, cli_type: str) -> str:
-        """Generate CLI installation section based on cli_type"""
-        if cli_type == "gemini":
-            return """RUN npm install -g @google/generative-ai-cli && \\
-    echo "Gemini CLI installed" && \\
-    # Create gemini config directory
-    mkdir -p /root/.config/gemini"""
-        elif cli_type == "codex":
-            return """RUN npm install -g @openai/codex && \\
-    echo "Codex CLI installed\""""
-        else:  # default to claude
-            return """RUN curl -fsSL https://claude.ai/install.sh | bash && \\
-    # Remove any default .claude.json created during installation
-    rm -f /root/.claude.json /root/.claude/settings.json 2>/dev/null || true && \\
-    echo "Claude CLI installed - default config removed to preserve user mounts\""""
-
-    def generate_agent_dockerfile(
-        self, base_image: str, cli_type: str = "claude"
-    ) -> str:
-        return f"""FROM {base_image}
+# Agent image Dockerfile; filled in with str.format (literal braces doubled)
+_AGENT_DOCKERFILE_TEMPLATE = """FROM {base_image}
 
 # Update package manager and install basic tools
 RUN if command -v apt-get >/dev/null 2>&1; then \\
@@ -80,7 +57,7 @@ RUN if command -v apt-get >/dev/null 2>&1; then \\
     fi
 
 # Install AI CLI based on cli_type
-{self._get_cli_install_section(cli_type)}
+{cli_install_section}
 
 # Install Python security scanning tools (optional)
 COPY security-requirements.txt /tmp/security-requirements.txt
@@ -92,20 +69,8 @@ RUN if command -v pip >/dev/null 2>&1; then \\
     rm /tmp/security-requirements.txt
 
 # Add security scanning utility script
-RUN echo '#!/bin/bash' > /usr/local/bin/ai-security-scan && \\
-    echo 'echo "🔍 AI Agent Security Scanner"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'echo "Available tools:"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'command -v bandit >/dev/null && echo "  ✅ bandit - Python security scanner"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'command -v safety >/dev/null && echo "  ✅ safety - Dependency vulnerability scanner"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'command -v semgrep >/dev/null && echo "  ✅ semgrep - Static analysis security scanner"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'echo ""' >> /usr/local/bin/ai-security-scan && \\
-    echo 'if [ "$1" = "scan" ]; then' >> /usr/local/bin/ai-security-scan && \\
-    echo '    echo "Running bandit security scan on Python files..."' >> /usr/local/bin/ai-security-scan && \\
-    echo '    find /workspace -name "*.py" -exec bandit -ll {{}} + 2>/dev/null || echo "No Python files found or bandit failed"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'else' >> /usr/local/bin/ai-security-scan && \\
-    echo '    echo "Usage: ai-security-scan scan"' >> /usr/local/bin/ai-security-scan && \\
-    echo 'fi' >> /usr/local/bin/ai-security-scan && \\
-    chmod +x /usr/local/bin/ai-security-scan
+COPY container/bin/ai-security-scan /usr/local/bin/ai-security-scan
+RUN chmod +x /usr/local/bin/ai-security-scan
 
 # Ensure PATH includes AI CLI tools and Python can import from /usr/local/bin
 ENV PATH="/root/.local/bin:$PATH"
@@ -121,25 +86,122 @@ WORKDIR /workspace
 ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
 """
 
+
+def _parse_volume_spec(spec: str) -> Optional[Tuple[str, str, str]]:
+    """Split a --volume value into (host, container, options), or None"""
+    match = _VOLUME_SPEC_RE.fullmatch(spec)
+    if match is None:
+        return None
+    return match["host"], match["container"], match["options"] or "rw"
+
+
+class ContainerManager:
+    # Timeout constants (in seconds)
+    DOCKER_BUILD_TIMEOUT = 300  # 5 minutes for Docker builds
+    BUILD_LOG_TAIL_LINES = 50  # Build output kept for failure messages
+
+    # Optional registry image whose inline cache seeds agent image builds,
+    # e.g. ghcr.io/org/claude-agent:cache on CI runners with a cold daemon
+    BUILD_CACHE_FROM = os.environ.get("TOREN_BUILD_CACHE_FROM")
+
+    def __init__(self, validator=None):
+        self.validator = validator
+        # Rendered agent Dockerfiles keyed by (base_image, cli_type)
+        self._dockerfile_cache: Dict[Tuple[str, str], str] = {}
+        # docker SDK client: None until first use, False if not installed
+        self._docker_client = None
+        # Images seen locally (or built) by this manager; agent tags are
+        # content hashes, so a present tag never needs re-checking
+        self._images_ready: Set[str] = set()
+        self._images_ready_lock = threading.Lock()
+
+    def _is_safe_env_var(self, env_var: str) -> bool:
+        """Basic safety check for environment variables when no validator is available"""
+        if not env_var or "=" not in env_var:
+            return False
+
+        if not _ENV_KEY_RE.fullmatch(env_var.partition("=")[0]):
+            return False
+
+        # Check for command injection patterns
+        dangerous_patterns = [";", "`", "$", "\n", "$(", "${", "|", "&", "\\"]
+        return not any(pattern in env_var for pattern in dangerous_patterns)
+
+    def _is_safe_input(self, input_str: str) -> bool:
+        """Basic safety check for general inputs"""
+        if not input_str:
+            return False
+
+        # No dangerous characters that could break shell/docker commands
+        dangerous_chars = [";", "`", "$", "\n", "\r", "|", "&", ">", "<"]
+        return not any(char in input_str for char in dangerous_chars)
+
+    def _get_cli_install_section(self, cli_type: str) -> str:
+        """Generate CLI installation section based on cli_type"""
+        if cli_type == "gemini":
+            return """RUN npm install -g @google/generative-ai-cli && \\
+    echo "Gemini CLI installed" && \\
+    # Create gemini config directory
+    mkdir -p /root/.config/gemini"""
+        elif cli_type == "codex":
+            return """RUN npm install -g @openai/codex && \\
+    echo "Codex CLI installed\""""
+        else:  # default to claude
+            return """RUN curl -fsSL https://claude.ai/install.sh | bash && \\
+    # Remove any default .claude.json created during installation
+    rm -f /root/.claude.json /root/.claude/settings.json 2>/dev/null || true && \\
+    echo "Claude CLI installed - default config removed to preserve user mounts\""""
+
+    def generate_agent_dockerfile(
+        self, base_image: str, cli_type: str = "claude"
+    ) -> str:
+        """Return the agent Dockerfile, rendering it once per image and CLI"""
+        key = (base_image, cli_type)
+        dockerfile = self._dockerfile_cache.get(key)
+        if dockerfile is None:
+            dockerfile = self._render_agent_dockerfile(base_image, cli_type)
+            self._dockerfile_cache[key] = dockerfile
+        return dockerfile
+
+    def _render_agent_dockerfile(self, base_image: str, cli_type: str) -> str:
+        return _AGENT_DOCKERFILE_TEMPLATE.format(
+            base_image=base_image,
+            cli_install_section=self._get_cli_install_section(cli_type),
+        )
+
     @contextmanager
     def docker_build_lock(self, agent_image: str):
         lock_file = (
             f"/tmp/docker_build_{hashlib.md5(agent_image.encode()).hexdigest()}.lock"
         )
+        # The lock file is never unlinked: removing it while another process
+        # waits on the old inode would let a third process lock a new one
+        fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
         try:
-            with open(lock_file, "w") as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                yield f
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _write_private_temp_file(
+        self, data: bytes, suffix: str, prefix: str = "tmp"
+    ) -> str:
+        """Write bytes to a new 0600 temp file (in /dev/shm when available)"""
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix=prefix, dir=_SECRET_TMP_DIR)
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        except OSError:
+            os.unlink(path)
+            raise
         finally:
-            Path(lock_file).unlink(missing_ok=True)
+            os.close(fd)
+        return path
 
     def _create_temp_credential_file(self, content: str, suffix: str) -> str:
         """Create a secure temporary credential file that must be manually cleaned up"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=suffix) as f:
-            f.write(content)
-            f.flush()
-            os.chmod(f.name, 0o600)
-            return f.name
+        return self._write_private_temp_file(content.encode(), suffix)
 
     def _cleanup_temp_files(self, temp_files: List[str]):
         """Clean up temporary credential files"""
@@ -156,19 +218,142 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
             self._cleanup_temp_files(process._temp_files)
             process._temp_files = []
 
-    def build_agent_image(self, base_image: str, cli_type: str = "claude") -> str:
-        agent_image = (
-            f"{cli_type}-agent-{hashlib.md5(base_image.encode()).hexdigest()[:10]}"
-        ).lower()
-
+    def _stream_docker_build(self, build_cmd: List[str]) -> Tuple[int, str]:
+        """
+        Run docker build, echoing step headers as they arrive and keeping only
+        the last BUILD_LOG_TAIL_LINES lines of output for error reporting.
+        Raises subprocess.TimeoutExpired after DOCKER_BUILD_TIMEOUT seconds.
+        """
+        tail: Deque[str] = deque(maxlen=self.BUILD_LOG_TAIL_LINES)
+        timed_out = threading.Event()
+
+        def kill_build():
+            timed_out.set()
+            process.kill()
+
+        process = subprocess.Popen(
+            build_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env={"DOCKER_BUILDKIT": "1", **os.environ},
+        )
+        stdout = process.stdout
+        assert stdout is not None  # stdout=PIPE
+        timer = threading.Timer(self.DOCKER_BUILD_TIMEOUT, kill_build)
+        timer.start()
         try:
+            with stdout:
+                for line in stdout:
+                    tail.append(line)
+                    # "Step 3/9 : ..." (legacy builder) or "#7 [3/9] ..." (BuildKit)
+                    if line.startswith("Step ") or (
+                        line.startswith("#") and " [" in line[:12]
+                    ):
+                        print(f"   {line.rstrip()}")
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            # Anything but a normal exit (Ctrl-C, a decode error) leaves the
+            # build running; don't leak it
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(build_cmd, self.DOCKER_BUILD_TIMEOUT)
+        return returncode, "".join(tail)
+
+    def _security_requirements_path(self) -> Path:
+        """Project security-requirements.txt, falling back to the bundled one"""
+        security_reqs_path = Path.cwd() / "security-requirements.txt"
+        if not security_reqs_path.exists():
+            security_reqs_path = _PACKAGE_DIR / "security-requirements.txt"
+        return security_reqs_path
+
+    def _build_context_files(self) -> List[Path]:
+        """Files copied into the agent image build context, in a stable order"""
+        files = [self._security_requirements_path()]
+        container_dir = _PACKAGE_DIR / "container"
+        if container_dir.exists():
+            files.extend(
+                sorted(
+                    path
+                    for path in container_dir.rglob("*")
+                    if path.is_file() and "__pycache__" not in path.parts
+                )
+            )
+        else:
+            files.append(_PACKAGE_DIR / "container_entrypoint.sh")
+        files.append(_PACKAGE_DIR / "github_utils.py")
+        files.append(_PACKAGE_DIR / "message_templates.py")
+        return files
+
+    def agent_image_tag(self, base_image: str, cli_type: str = "claude") -> str:
+        """
+        Tag derived from the rendered Dockerfile and every build context file,
+        so any change to the template or bundled scripts produces a new image.
+        """
+        digest = hashlib.sha256(base_image.encode())
+        digest.update(self.generate_agent_dockerfile(base_image, cli_type).encode())
+        for path in self._build_context_files():
+            try:
+                digest.update(str(path.relative_to(_PACKAGE_DIR)).encode())
+            except ValueError:
+                digest.update(path.name.encode())
+            if path.exists():
+                digest.update(path.read_bytes())
+        return f"{cli_type}-agent-{digest.hexdigest()[:12]}".lower()
+
+    def _docker_sdk_client(self):
+        """Client from the optional docker SDK, or None to fall back to the CLI"""
+        if self._docker_client is None:
+            self._docker_client = False
+            try:
+                import docker
+
+                self._docker_client = docker.from_env()
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"⚠️ Docker SDK unavailable, using docker CLI: {e}")
+        return self._docker_client or None
+
+    def _mark_image_ready(self, image: str) -> None:
+        with self._images_ready_lock:
+            self._images_ready.add(image)
+
+    def _image_exists(self, image: str) -> bool:
+        """Check for a local image over the SDK connection, or via docker images"""
+        with self._images_ready_lock:
+            if image in self._images_ready:
+                return True
+
+        exists = None
+        client = self._docker_sdk_client()
+        if client is not None:
+            try:
+                exists = bool(client.images.list(name=image))
+            except Exception:
+                pass
+        if exists is None:
             result = subprocess.run(
-                ["docker", "images", "-q", agent_image],
+                ["docker", "images", "-q", image],
                 capture_output=True,
                 text=True,
                 check=False,
             )
-            if result.stdout.strip():
+            exists = bool(result.stdout.strip())
+
+        if exists:
+            self._mark_image_ready(image)
+        return exists
+
+    def build_agent_image(self, base_image: str, cli_type: str = "claude") -> str:
+        agent_image = self.agent_image_tag(base_image, cli_type)
+
+        try:
+            if self._image_exists(agent_image):
                 print(f"🔄 Reusing existing image: {agent_image}")
                 return agent_image
         except OSError as e:
@@ -176,9 +361,16 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
         except subprocess.SubprocessError as e:
             print(f"⚠️ Failed to check existing Docker image: {e}")
 
-        print(f"🐳 Building agent image from {base_image}...")
-
         with self.docker_build_lock(agent_image):
+            # Double-check: a concurrent job may have built it while we waited
+            try:
+                if self._image_exists(agent_image):
+                    print(f"🔄 Reusing image built by another job: {agent_image}")
+                    return agent_image
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+            print(f"🐳 Building agent image from {base_image}...")
             dockerfile_content = self.generate_agent_dockerfile(base_image, cli_type)
 
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -186,20 +378,11 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
                 dockerfile_path.write_text(dockerfile_content)
 
                 # Try current directory first, then fall back to package bundled version
-                security_reqs_path = Path.cwd() / "security-requirements.txt"
-                if not security_reqs_path.exists():
-                    security_reqs_path = (
-                        Path(__file__).parent / "security-requirements.txt"
-                    )
+                security_reqs_path = self._security_requirements_path()
 
                 if security_reqs_path.exists():
-                    subprocess.run(
-                        [
-                            "cp",
-                            str(security_reqs_path),
-                            str(Path(temp_dir) / "security-requirements.txt"),
-                        ],
-                        check=True,
+                    shutil.copyfile(
+                        security_reqs_path, Path(temp_dir) / "security-requirements.txt"
                     )
                 else:
                     # Fallback to default security tools
@@ -207,66 +390,54 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
                         "bandit>=1.7.0\nsafety>=2.0.0\npip-audit>=2.0.0\n"
                     )
 
-                # Copy refactored container directory
-                container_dir = Path(__file__).parent / "container"
+                # Copy refactored container directory (copytree keeps script modes)
+                container_dir = _PACKAGE_DIR / "container"
                 if container_dir.exists():
-                    subprocess.run(
-                        ["cp", "-r", str(container_dir), str(temp_dir)],
-                        check=True,
+                    shutil.copytree(
+                        container_dir,
+                        Path(temp_dir) / "container",
+                        ignore=shutil.ignore_patterns("__pycache__"),
                     )
                 else:
                     # Fallback to old entrypoint for backward compatibility
-                    entrypoint_path = Path(__file__).parent / "container_entrypoint.sh"
+                    entrypoint_path = _PACKAGE_DIR / "container_entrypoint.sh"
                     if entrypoint_path.exists():
                         (Path(temp_dir) / "container").mkdir()
-                        subprocess.run(
-                            [
-                                "cp",
-                                str(entrypoint_path),
-                                str(Path(temp_dir) / "container" / "entrypoint.sh"),
-                            ],
-                            check=True,
+                        shutil.copyfile(
+                            entrypoint_path,
+                            Path(temp_dir) / "container" / "entrypoint.sh",
                         )
 
-                # Copy github_utils.py for container operations
-                github_utils_path = Path(__file__).parent / "github_utils.py"
-                if github_utils_path.exists():
-                    subprocess.run(
-                        [
-                            "cp",
-                            str(github_utils_path),
-                            str(Path(temp_dir) / "github_utils.py"),
-                        ],
-                        check=True,
-                    )
-
-                # Copy message_templates.py for container operations
-                message_templates_path = Path(__file__).parent / "message_templates.py"
-                if message_templates_path.exists():
-                    subprocess.run(
-                        [
-                            "cp",
-                            str(message_templates_path),
-                            str(Path(temp_dir) / "message_templates.py"),
-                        ],
-                        check=True,
-                    )
+                # Copy github_utils.py and message_templates.py for container operations
+                for module_name in ("github_utils.py", "message_templates.py"):
+                    module_path = _PACKAGE_DIR / module_name
+                    if module_path.exists():
+                        shutil.copyfile(module_path, Path(temp_dir) / module_name)
+
+                # Inline cache metadata lets a pushed agent image seed later builds
+                build_cmd = [
+                    "docker",
+                    "build",
+                    "--build-arg",
+                    "BUILDKIT_INLINE_CACHE=1",
+                ]
+                # agent_image itself is never a cache source here: this only
+                # runs when that content-hashed tag is missing locally
+                if self.BUILD_CACHE_FROM:
+                    build_cmd += ["--cache-from", self.BUILD_CACHE_FROM]
+                build_cmd += ["-t", agent_image, temp_dir]
 
                 try:
-                    result = subprocess.run(
-                        ["docker", "build", "-t", agent_image, temp_dir],
-                        capture_output=True,
-                        text=True,
-                        timeout=self.DOCKER_BUILD_TIMEOUT,
-                    )
+                    returncode, output_tail = self._stream_docker_build(build_cmd)
 
-                    if result.returncode != 0:
-                        print(f"❌ Docker build failed: {result.stderr}")
+                    if returncode != 0:
+                        print(f"❌ Docker build failed: {output_tail}")
                         raise RuntimeError(
-                            f"Failed to build agent image: {result.stderr}"
+                            f"Failed to build agent image: {output_tail}"
                         )
 
                     print(f"✅ Built agent image: {agent_image}")
+                    self._mark_image_ready(agent_image)
                     return agent_image
 
                 except subprocess.TimeoutExpired:
@@ -298,64 +469,77 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
         # Track temp files for cleanup after container starts
         temp_files = []
 
+        # Container environment; later assignments win, like repeated -e flags
+        env: Dict[str, str] = {}
+
+        # The gh and git lookups below are independent local/network round
+        # trips, so they run concurrently; results are consumed in order
+        def run_quiet(cmd: List[str]) -> subprocess.CompletedProcess:
+            return subprocess.run(cmd, capture_output=True, text=True, check=False)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            gh_token_future = (
+                None
+                if github_token
+                else executor.submit(
+                    run_quiet, ["gh", "auth", "status", "--show-token"]
+                )
+            )
+            gh_user_future = executor.submit(
+                run_quiet, ["gh", "api", "user", "--jq", ".login"]
+            )
+            git_user_future = executor.submit(
+                run_quiet, ["git", "config", "--get", "user.name"]
+            )
+            git_email_future = executor.submit(
+                run_quiet, ["git", "config", "--get", "user.email"]
+            )
+
         # Get GitHub token and username from gh CLI if not provided
-        if not github_token:
+        if gh_token_future is not None:
             try:
-                gh_token_result = subprocess.run(
-                    ["gh", "auth", "status", "--show-token"], 
-                    capture_output=True, text=True, check=False
-                )
+                gh_token_result = gh_token_future.result()
                 if gh_token_result.returncode == 0:
                     # GitHub CLI outputs to stderr, check both stdout and stderr
                     output = gh_token_result.stdout + gh_token_result.stderr
-                    if "Token:" in output:
-                        # Extract token from "Token: gho_xxxx" line
-                        for line in output.split('\n'):
-                            if 'Token:' in line:
-                                github_token = line.split('Token:')[1].strip()
-                                print(f"✅ GitHub token configured ({len(github_token)} chars)")
-                                break
+                    # Extract token from "Token: gho_xxxx" line
+                    for line in output.splitlines():
+                        if 'Token:' in line:
+                            github_token = line.split('Token:')[1].strip()
+                            print(f"✅ GitHub token configured ({len(github_token)} chars)")
+                            break
             except Exception as e:
                 print(f"⚠️  Warning: Could not get GitHub token: {e}")
 
         if github_token:
-            docker_cmd.extend(["-e", f"GITHUB_TOKEN={github_token}"])
+            env["GITHUB_TOKEN"] = github_token
 
         # Get GitHub username for HTTPS authentication
         try:
-            gh_user_result = subprocess.run(
-                ["gh", "api", "user", "--jq", ".login"], 
-                capture_output=True, text=True, check=False
-            )
+            gh_user_result = gh_user_future.result()
             if gh_user_result.returncode == 0 and gh_user_result.stdout.strip():
                 github_username = gh_user_result.stdout.strip()
-                docker_cmd.extend(["-e", f"GITHUB_USERNAME={github_username}"])
+                env["GITHUB_USERNAME"] = github_username
                 print(f"✅ GitHub username: {github_username}")
         except Exception as e:
             print(f"⚠️  Warning: Could not get GitHub username: {e}")
 
         # Pass Git configuration to container
         try:
-            git_user_result = subprocess.run(
-                ["git", "config", "--get", "user.name"], 
-                capture_output=True, text=True, check=False
-            )
+            git_user_result = git_user_future.result()
             if git_user_result.returncode == 0 and git_user_result.stdout.strip():
                 git_username = git_user_result.stdout.strip()
                 # Escape quotes and special characters for Docker
                 git_username_escaped = git_username.replace('"', '\\"')
-                docker_cmd.extend(["-e", f"GIT_AUTHOR_NAME={git_username_escaped}"])
-                docker_cmd.extend(["-e", f"GIT_COMMITTER_NAME={git_username_escaped}"])
+                env["GIT_AUTHOR_NAME"] = git_username_escaped
+                env["GIT_COMMITTER_NAME"] = git_username_escaped
                 
-            git_email_result = subprocess.run(
-                ["git", "config", "--get", "user.email"], 
-                capture_output=True, text=True, check=False
-            )
+            git_email_result = git_email_future.result()
             if git_email_result.returncode == 0 and git_email_result.stdout.strip():
                 git_email = git_email_result.stdout.strip()
                 git_email_escaped = git_email.replace('"', '\\"')
-                docker_cmd.extend(["-e", f"GIT_AUTHOR_EMAIL={git_email_escaped}"])
-                docker_cmd.extend(["-e", f"GIT_COMMITTER_EMAIL={git_email_escaped}"])
+                env["GIT_AUTHOR_EMAIL"] = git_email_escaped
+                env["GIT_COMMITTER_EMAIL"] = git_email_escaped
                 
         except Exception as e:
             print(f"⚠️  Warning: Could not get Git user config: {e}")
@@ -367,7 +551,7 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
                 temp_files.append(key_file)
                 docker_cmd.extend(["-v", f"{key_file}:/tmp/anthropic_key:ro"])
             elif cli_type == "codex":
-                docker_cmd.extend(["-e", f"OPENAI_API_KEY={ai_api_key}"])
+                env["OPENAI_API_KEY"] = ai_api_key
 
         gitconfig_path = Path.home() / ".gitconfig"
         if gitconfig_path.exists() and self.validator:
@@ -405,14 +589,12 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
 
         if custom_volumes:
             for volume in custom_volumes:
-                if ":" not in volume:
+                parsed = _parse_volume_spec(volume)
+                if parsed is None:
                     print(f"⚠️  Warning: Invalid volume format: {volume}")
                     continue
 
-                host_path, container_path = volume.split(":", 1)
-                permissions = "rw"
-                if ":" in container_path:
-                    container_path, permissions = container_path.rsplit(":", 1)
+                host_path, container_path, permissions = parsed
 
                 try:
                     host_path_obj = Path(host_path)
@@ -434,49 +616,43 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
                     print(f"⚠️  Warning: Skipping volume {host_path}: {e}")
 
         if custom_envs:
-            for env in custom_envs:
+            for custom_env in custom_envs:
                 try:
                     if self.validator:
-                        validated_env = self.validator.validate_env_var(env)
-                        docker_cmd.extend(["-e", validated_env])
-                    else:
+                        custom_env = self.validator.validate_env_var(custom_env)
+                    elif not self._is_safe_env_var(custom_env):
                         # Basic validation fallback
-                        if self._is_safe_env_var(env):
-                            docker_cmd.extend(["-e", env])
-                        else:
-                            print("⚠️  Warning: Skipping unsafe environment variable")
+                        print("⚠️  Warning: Skipping unsafe environment variable")
+                        continue
+                    key, value = custom_env.split("=", 1)
+                    env[key] = value
                 except ValueError as e:
                     print(f"⚠️  Warning: Skipping invalid environment variable: {e}")
 
         # Set environment variables for the container instead of command arguments
-        docker_cmd.extend(["-e", f"BRANCH_NAME={branch_name}"])
+        env["BRANCH_NAME"] = branch_name
         
         # Set GitHub issue number environment variables for notifications
         if issue_number:
             # Handle both direct issue numbers and GitHub URLs
             if "github.com" in issue_number and "/issues/" in issue_number:
                 # Extract issue number from URL like https://github.com/user/repo/issues/123
-                issue_num = issue_number.split("/")[-1]
-                docker_cmd.extend(["-e", f"GITHUB_ISSUE_NUMBER={issue_num}"])
+                issue_num = issue_number.rpartition("/")[2]
+                env["GITHUB_ISSUE_NUMBER"] = issue_num
             elif "github.com" in issue_number and "/pull/" in issue_number:
                 # Extract PR number from URL like https://github.com/user/repo/pull/123
-                pr_num = issue_number.split("/")[-1]
-                docker_cmd.extend(["-e", f"PR_NUMBER={pr_num}"])
+                pr_num = issue_number.rpartition("/")[2]
+                env["PR_NUMBER"] = pr_num
             else:
                 # Assume it's a direct issue/PR number
                 issue_num = issue_number.replace("#", "")
-                docker_cmd.extend(["-e", f"GITHUB_ISSUE_NUMBER={issue_num}"])
+                env["GITHUB_ISSUE_NUMBER"] = issue_num
         
-        import tempfile
-        task_spec_fd, task_spec_path = tempfile.mkstemp(suffix=".md", prefix="task_spec_")
-        try:
-            with os.fdopen(task_spec_fd, 'w') as f:
-                f.write(task_spec)
-            docker_cmd.extend(["-v", f"{task_spec_path}:/tmp/task_spec.md:ro"])
-            temp_files.append(task_spec_path)
-        except Exception as e:
-            os.close(task_spec_fd)
-            raise
+        task_spec_path = self._write_private_temp_file(
+            task_spec.encode("utf-8"), ".md", prefix="task_spec_"
+        )
+        docker_cmd.extend(["-v", f"{task_spec_path}:/tmp/task_spec.md:ro"])
+        temp_files.append(task_spec_path)
 
         # Mount cost data directory to persist Claude usage data
         if job_id:
@@ -484,6 +660,9 @@ ENTRYPOINT ["/usr/local/container/entrypoint.sh"]
             cost_data_host_dir.mkdir(parents=True, exist_ok=True)
             docker_cmd.extend(["-v", f"{cost_data_host_dir}:/tmp/cost_data:rw"])
 
+        for key, value in env.items():
+            docker_cmd.extend(["-e", f"{key}={value}"])
+
         # Validate and sanitize other inputs
         try:
             if self.validator:
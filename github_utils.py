@@ -9,7 +9,8 @@ import json
 import os
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from message_templates import MessageTemplates
 
@@ -35,25 +36,28 @@ class GitHubAuthError(GitHubError):
     """GitHub authentication failed"""
 
 
+# Written by the in-container cost monitor after every AI turn
+_SESSION_COST_FILE = Path("/tmp/cost_data/session_cost.json")
+
+
 class GitHubUtils:
     def __init__(self, default_reviewer: str = "vikranth22446"):
         self.default_reviewer = default_reviewer
+        # ((mtime_ns, size) of the session cost file, formatted comment text)
+        self._cost_info_cache: Optional[Tuple[Tuple[int, int], str]] = None
 
     def run_gh_command(self, cmd: list) -> str:
         """Run gh CLI command and return output, raising GitHubError on failure"""
         full_cmd = ["gh"] + cmd
         try:
-            result = subprocess.run(
-                full_cmd, capture_output=True, text=True, check=True
-            )
-            return result.stdout.strip()
+            # Capture bytes and decode once; PR diffs and comment lists can be large
+            result = subprocess.run(full_cmd, capture_output=True, check=True)
+            return result.stdout.decode("utf-8", "replace").strip()
         except subprocess.CalledProcessError as e:
-            if (
-                "authentication" in e.stderr.lower()
-                or "unauthorized" in e.stderr.lower()
-            ):
+            stderr = e.stderr.decode("utf-8", "replace")
+            if "authentication" in stderr.lower() or "unauthorized" in stderr.lower():
                 raise GitHubAuthError(
-                    MessageTemplates.GITHUB_AUTH_FAILED.format(error=e.stderr.strip())
+                    MessageTemplates.GITHUB_AUTH_FAILED.format(error=stderr.strip())
                 )
 
             if e.returncode == 4:
@@ -64,7 +68,7 @@ class GitHubUtils:
                 )
 
             raise GitHubAPIError(
-                f"GitHub CLI command failed: {e.stderr.strip()}",
+                f"GitHub CLI command failed: {stderr.strip()}",
                 command=full_cmd,
                 exit_code=e.returncode,
             )
@@ -306,40 +310,52 @@ class GitHubUtils:
     def _get_cost_info_for_comment(self) -> str:
         """Get formatted cost information for GitHub comments"""
         try:
-            import json
-            from pathlib import Path
-
-            # Try to load cost information from the shared location
-            cost_file = Path("/tmp/cost_data/session_cost.json")
-            if cost_file.exists():
-                with open(cost_file, "r") as f:
-                    session_data = json.load(f)
-
-                summary = session_data.get("summary", {})
-                cost = summary.get("total_cost", 0.0)
-                tokens = summary.get("total_tokens", 0)
-                lines = summary.get("lines_changed", 0)
-                files = summary.get("files_changed", 0)
-
-                if cost > 0 or lines > 0:
-                    cost_lines = []
-                    if cost > 0:
-                        cost_lines.append(f"💰 **Cost**: ${cost:.4f}")
-                    if tokens > 0:
-                        cost_lines.append(f"🔤 **Tokens**: {tokens:,}")
-                    if lines > 0:
-                        cost_lines.append(f"📝 **Lines Changed**: {lines}")
-                    if files > 0:
-                        cost_lines.append(f"📁 **Files Modified**: {files}")
-
-                    return "\n" + "\n".join(cost_lines) + "\n"
+            stat = _SESSION_COST_FILE.stat()
+        except FileNotFoundError:
+            return ""
+        except PermissionError:
+            print("⚠️ Permission denied accessing cost data")
+            return ""
+
+        # The cost monitor rewrites the file after each turn; until then the
+        # completion comment and PR body reuse one parse
+        epoch = (stat.st_mtime_ns, stat.st_size)
+        if self._cost_info_cache is not None and self._cost_info_cache[0] == epoch:
+            return self._cost_info_cache[1]
+
+        cost_info = ""
+        try:
+            with open(_SESSION_COST_FILE, "r") as f:
+                session_data = json.load(f)
+
+            summary = session_data.get("summary", {})
+            cost = summary.get("total_cost", 0.0)
+            tokens = summary.get("total_tokens", 0)
+            lines = summary.get("lines_changed", 0)
+            files = summary.get("files_changed", 0)
+
+            if cost > 0 or lines > 0:
+                cost_lines = []
+                if cost > 0:
+                    cost_lines.append(f"💰 **Cost**: ${cost:.4f}")
+                if tokens > 0:
+                    cost_lines.append(f"🔤 **Tokens**: {tokens:,}")
+                if lines > 0:
+                    cost_lines.append(f"📝 **Lines Changed**: {lines}")
+                if files > 0:
+                    cost_lines.append(f"📁 **Files Modified**: {files}")
+
+                cost_info = "\n" + "\n".join(cost_lines) + "\n"
         except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError) as e:
             # Cost info not available or malformed - this is expected in many cases
             print(f"ℹ️ Cost information unavailable: {type(e).__name__}")
+            return ""
         except PermissionError:
             print("⚠️ Permission denied accessing cost data")
+            return ""
 
-        return ""
+        self._cost_info_cache = (epoch, cost_info)
+        return cost_info
 
     def notify_error(
         self,
@@ -394,7 +410,7 @@ class GitHubUtils:
         if issue_number:
             # Extract just the number if it's a full URL
             if "github.com" in issue_number:
-                issue_num = issue_number.split("/")[-1]
+                issue_num = issue_number.rpartition("/")[2]
             else:
                 issue_num = issue_number.replace("#", "")
             issue_ref = f"\nCloses #{issue_num}"
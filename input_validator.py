@@ -1,17 +1,99 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import re
+import string
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+
+_BRANCH_RE = re.compile(r"^[a-zA-Z0-9._/-]{1,100}$")
+_DOCKER_IMAGE_RE = re.compile(r"^[a-z0-9._/-]+(?::[a-zA-Z0-9._-]+)?$")
+_ENV_KEY_RE = re.compile(r"[A-Z_][A-Z0-9_]*")
+_GITHUB_URL_PREFIX = "https://github.com/"
+_GITHUB_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "._-")
+_DOCKER_NAME_CHARS = frozenset(string.ascii_lowercase + string.digits + "._/-")
+_DOCKER_TAG_CHARS = frozenset(string.ascii_lowercase + string.digits + "._-")
+
+_DANGER_LABELS = (
+    r"\bpassword\b",
+    r"\bapi[_\s]?key\b",
+    r"\bsecret\b",
+    r"\btoken\b",
+    r"\bcredential\b",
+    r"\bprivate[_\s]?key\b",
+    r"\bhardcode\b",
+    r"\bexpose\b.*\b(database|db)\b",
+    r"\bpublic\b.*\b(sensitive|private)\b",
+)
+# One pass over the spec: each pattern is a named lookahead, so a long match
+# (e.g. "expose ... db") never hides another pattern starting inside it
+_DANGER_RE = re.compile(
+    "|".join(f"(?=(?P<d{i}>{label}))" for i, label in enumerate(_DANGER_LABELS)),
+    re.IGNORECASE,
+)
+# Every danger pattern contains one of these words; specs without any of
+# them are cleared with plain substring checks and never reach the regex
+_DANGER_KEYWORDS = (
+    "password",
+    "api",
+    "secret",
+    "token",
+    "credential",
+    "private",
+    "hardcode",
+    "expose",
+    "public",
+)
+
+# Deleted via bytes.translate; a value is rejected if deletion changes it
+_BRANCH_FORBIDDEN = b"~^:[]?*"
+_DOCKER_FORBIDDEN = b";&|`$()<>\"'"
+
+
+def _github_url_number(url: str, kind: str) -> Optional[str]:
+    """Return N from https://github.com/<owner>/<repo>/<kind>/<N>, or None"""
+    if not url.startswith(_GITHUB_URL_PREFIX):
+        return None
+    parts = url[len(_GITHUB_URL_PREFIX) :].split("/")
+    if len(parts) != 4 or parts[2] != kind:
+        return None
+    owner, repo, _, number = parts
+    if not (
+        owner
+        and repo
+        and _GITHUB_NAME_CHARS.issuperset(owner)
+        and _GITHUB_NAME_CHARS.issuperset(repo)
+    ):
+        return None
+    if not (number.isascii() and number.isdigit()):
+        return None
+    return number
+
+
+@dataclass(frozen=True)
+class ValidatedJobInputs:
+    """Job inputs that have already passed validation and sanitization"""
+
+    __slots__ = ("branch", "base_image", "issue_url", "pr_number", "spec_path")
+
+    # Empty in --pr mode until the PR's head branch is looked up
+    branch: str
+    base_image: str
+    issue_url: Optional[str]
+    pr_number: Optional[str]
+    spec_path: Optional[Path]
 
 
 class InputValidator:
     def __init__(self):
-        self.branch_name_pattern = re.compile(r"^[a-zA-Z0-9._/-]{1,100}$")
-        self.docker_image_pattern = re.compile(r"^[a-z0-9._/-]+(?::[a-zA-Z0-9._-]+)?$")
-        self.github_issue_pattern = re.compile(
-            r"^https://github\.com/[a-zA-Z0-9._-]+/[a-zA-Z0-9._-]+/issues/\d+$"
+        # Resolved once; mount paths are checked against these prefixes
+        self._safe_dir_prefixes = tuple(
+            os.path.join(str(safe_dir.resolve()), "")
+            for safe_dir in (Path.home(), Path.cwd(), Path("/tmp"), Path("/var/tmp"))
+            if safe_dir.exists()
         )
 
     def sanitize_branch_name(self, branch_name: str) -> str:
@@ -20,19 +102,19 @@ class InputValidator:
 
         branch_name = branch_name.strip()
 
-        if not self.branch_name_pattern.match(branch_name):
+        if not _BRANCH_RE.match(branch_name):
             raise ValueError(
                 f"Invalid branch name format: {branch_name}. Use only letters, numbers, dots, underscores, hyphens, and forward slashes."
             )
 
-        if any(
-            char in branch_name for char in ["..", "~", "^", ":", "[", "]", "?", "*"]
-        ):
+        # The format check above guarantees ASCII
+        raw = branch_name.encode("ascii")
+        if b".." in raw or raw.translate(None, _BRANCH_FORBIDDEN) != raw:
             raise ValueError(
                 f"Branch name contains forbidden characters: {branch_name}"
             )
 
-        if branch_name.startswith("-") or branch_name.endswith("-"):
+        if raw.startswith(b"-") or raw.endswith(b"-"):
             raise ValueError(
                 f"Branch name cannot start or end with hyphen: {branch_name}"
             )
@@ -45,15 +127,20 @@ class InputValidator:
 
         image_name = image_name.strip().lower()
 
-        if not self.docker_image_pattern.match(image_name):
+        # Fast path for plain name[:tag]; the regex only runs on odd input
+        name, colon, tag = image_name.partition(":")
+        simple = (
+            name
+            and _DOCKER_NAME_CHARS.issuperset(name)
+            and (not colon or (tag and _DOCKER_TAG_CHARS.issuperset(tag)))
+        )
+        if not simple and not _DOCKER_IMAGE_RE.match(image_name):
             raise ValueError(
                 f"Invalid Docker image format: {image_name}. Use format: name:tag or registry/name:tag"
             )
 
-        if any(
-            char in image_name
-            for char in [";", "&", "|", "`", "$", "(", ")", "<", ">", '"', "'"]
-        ):
+        raw = image_name.encode("ascii")
+        if raw.translate(None, _DOCKER_FORBIDDEN) != raw:
             raise ValueError(
                 f"Docker image name contains forbidden characters: {image_name}"
             )
@@ -71,12 +158,12 @@ class InputValidator:
 
         issue_url = issue_url.strip()
 
-        if not self.github_issue_pattern.match(issue_url):
-            raise ValueError(f"Invalid GitHub issue URL format: {issue_url}")
-
         if len(issue_url) > 500:
             raise ValueError(f"GitHub issue URL too long: {issue_url}")
 
+        if _github_url_number(issue_url, "issues") is None:
+            raise ValueError(f"Invalid GitHub issue URL format: {issue_url}")
+
         return issue_url
 
     def sanitize_pr_number(self, pr_number: str) -> str:
@@ -85,19 +172,16 @@ class InputValidator:
 
         pr_number = pr_number.strip()
 
-        if pr_number.isdigit():
-            if len(pr_number) > 10:
-                raise ValueError("PR number too long")
-            return pr_number
+        # A bare number has no "/"; anything else must be a PR URL
+        _, sep, number = pr_number.rpartition("/")
+        if sep and _github_url_number(pr_number, "pull") is None:
+            number = ""
+        if not (number.isascii() and number.isdigit()):
+            raise ValueError(f"Invalid GitHub PR number or URL format: {pr_number}")
 
-        github_pr_pattern = r"^https://github\.com/[\w\-_.]+/[\w\-_.]+/pull/\d+$"
-        if re.match(github_pr_pattern, pr_number):
-            number = pr_number.split("/")[-1]
-            if len(number) > 10:
-                raise ValueError("PR number too long")
-            return number
-
-        raise ValueError(f"Invalid GitHub PR number or URL format: {pr_number}")
+        if len(number) > 10:
+            raise ValueError("PR number too long")
+        return number
 
     def validate_mount_path(self, path: Path, description: str) -> Path:
         try:
@@ -106,19 +190,8 @@ class InputValidator:
             if not resolved_path.exists():
                 raise ValueError(f"{description} does not exist: {resolved_path}")
 
-            safe_dirs = [Path.home(), Path.cwd(), Path("/tmp"), Path("/var/tmp")]
-
-            is_safe = False
-            for safe_dir in safe_dirs:
-                try:
-                    resolved_safe_dir = safe_dir.resolve()
-                    resolved_path.relative_to(resolved_safe_dir)
-                    is_safe = True
-                    break
-                except ValueError:
-                    continue
-
-            if not is_safe:
+            resolved_prefix = os.path.join(str(resolved_path), "")
+            if not resolved_prefix.startswith(self._safe_dir_prefixes):
                 raise ValueError(
                     f"{description} is outside safe directories: {resolved_path}"
                 )
@@ -132,90 +205,111 @@ class InputValidator:
         except (TypeError, AttributeError) as e:
             raise ValueError(f"Invalid {description} - invalid path format: {e}")
 
-    def validate_inputs(self, args: argparse.Namespace) -> bool:
+    def validate_inputs(
+        self, args: argparse.Namespace
+    ) -> Optional[ValidatedJobInputs]:
+        """
+        Validate run arguments once, returning the sanitized values.
+        Returns None (after printing the error) if validation fails.
+        """
         try:
-            input_count = sum(bool(x) for x in [args.spec, args.issue, args.pr])
-            if input_count == 0:
-                print("❌ Error: Must provide one of --spec, --issue, or --pr")
-                return False
-            elif input_count > 1:
-                print(
-                    "❌ Error: Can only specify one of --spec, --issue, or --pr at a time"
-                )
-                return False
-
-            if args.spec and not Path(args.spec).exists():
+            # --short is free text for the prompt; it only counts as a source
+            short = getattr(args, "short", None)
+            if args.spec and short:
+                print("❌ Error: Cannot specify both --spec and --short. Choose one.")
+                return None
+            if not (args.spec or short or args.issue or args.pr):
+                print("❌ Error: Must provide one of --spec, --short, --issue, or --pr")
+                return None
+
+            spec_path = Path(args.spec) if args.spec else None
+            if spec_path and not spec_path.exists():
                 print(f"❌ Error: Spec file not found: {args.spec}")
-                return False
+                return None
 
+            issue_url = None
             if args.issue:
                 try:
-                    args.issue = self.sanitize_github_issue_url(args.issue)
+                    issue_url = self.sanitize_github_issue_url(args.issue)
                 except ValueError as e:
                     print(f"❌ Error: {e}")
-                    return False
+                    return None
 
+            pr_number = None
             if args.pr:
                 try:
-                    args.pr = self.sanitize_pr_number(args.pr)
+                    pr_number = self.sanitize_pr_number(args.pr)
                 except ValueError as e:
                     print(f"❌ Error: {e}")
-                    return False
+                    return None
 
-            if not args.pr and not args.branch:
+            branch = ""
+            if not pr_number and not args.branch:
                 print("❌ Error: --branch is required when not using --pr mode")
-                return False
+                return None
             elif args.branch:
                 try:
-                    args.branch = self.sanitize_branch_name(args.branch)
+                    branch = self.sanitize_branch_name(args.branch)
                 except ValueError as e:
                     print(f"❌ Error: {e}")
-                    return False
+                    return None
 
             if not args.base_image:
                 print(
                     "❌ Error: --base-image is required. Set it via command line or config.json"
                 )
-                return False
+                return None
 
             try:
-                args.base_image = self.sanitize_docker_image(args.base_image)
+                base_image = self.sanitize_docker_image(args.base_image)
             except ValueError as e:
                 print(f"❌ Error: {e}")
-                return False
-
-            return True
+                return None
+
+            return ValidatedJobInputs(
+                branch=branch,
+                base_image=base_image,
+                issue_url=issue_url,
+                pr_number=pr_number,
+                spec_path=spec_path,
+            )
 
         except (AttributeError, TypeError) as e:
             print(f"❌ Input validation error - invalid argument format: {e}")
-            return False
+            return None
         except ValueError as e:
             print(f"❌ Input validation error - invalid value: {e}")
-            return False
+            return None
         except RuntimeError as e:
             print(f"❌ Input validation error - runtime issue: {e}")
-            return False
+            return None
 
     def validate_spec_safety(self, content: str) -> List[str]:
         concerns = []
 
-        danger_patterns = [
-            r"\bpassword\b",
-            r"\bapi[_\s]?key\b",
-            r"\bsecret\b",
-            r"\btoken\b",
-            r"\bcredential\b",
-            r"\bprivate[_\s]?key\b",
-            r"\bhardcode\b",
-            r"\bexpose\b.*\b(database|db)\b",
-            r"\bpublic\b.*\b(sensitive|private)\b",
-        ]
-
-        for pattern in danger_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                concerns.append(f"Potential security/privacy issue: {pattern}")
-
-        if len(content.split("\n")) > 100:
+        # Non-ASCII text goes straight to the regex: IGNORECASE folds some
+        # characters (e.g. "\u017f" to "s") that str.lower() does not
+        if content.isascii():
+            lowered = content.lower()
+            scan = any(keyword in lowered for keyword in _DANGER_KEYWORDS)
+        else:
+            scan = True
+
+        found = set()
+        if scan:
+            for match in _DANGER_RE.finditer(content):
+                # Every alternative is a named group, so one always matched
+                assert match.lastgroup is not None
+                found.add(int(match.lastgroup[1:]))
+                if len(found) == len(_DANGER_LABELS):
+                    break
+        for index in sorted(found):
+            concerns.append(
+                f"Potential security/privacy issue: {_DANGER_LABELS[index]}"
+            )
+
+        # Counting newlines avoids building a list of every line
+        if content.count("\n") + 1 > 100:
             concerns.append("Spec is very large - may result in oversized PR")
 
         return concerns
@@ -234,7 +328,7 @@ class InputValidator:
         if not key:
             raise ValueError("Environment variable name cannot be empty")
 
-        if not re.match(r"^[A-Z_][A-Z0-9_]*$", key):
+        if not _ENV_KEY_RE.fullmatch(key):
             raise ValueError(
                 f"Invalid environment variable name: {key}. "
                 "Must start with letter/underscore and contain only uppercase letters, numbers, underscores."
@@ -15,7 +15,7 @@ import uuid
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class JobManager:
@@ -27,7 +27,6 @@ class JobManager:
     DOCKER_STOP_TIMEOUT = 10
     DOCKER_REMOVE_TIMEOUT = 10
     DOCKER_RMI_TIMEOUT = 30
-    GIT_STATS_TIMEOUT = 30
     PROCESS_WAIT_TIMEOUT = 5
 
     # Required job data keys for validation
@@ -44,6 +43,9 @@ class JobManager:
     # Valid job status values
     VALID_STATUSES = {"queued", "running", "completed", "failed", "cancelled"}
 
+    # One line per container so status and exit code come from a single inspect
+    CONTAINER_STATE_FORMAT = "{{.Name}} {{.State.Status}} {{.State.ExitCode}}"
+
     def __init__(self):
         # Path.home() temporariyl full TODO FIXME
         self.jobs_dir = Path.cwd() / ".ai_agent" / "jobs"
@@ -153,15 +155,21 @@ class JobManager:
         base_branch: str,
         github_issue: Optional[str] = None,
         cli_type: str = "claude",
+        ai_summary: Optional[str] = None,
     ) -> str:
-        """Create a new background job"""
+        """
+        Create a new background job. The AI summary is generated here unless
+        the caller passes one (e.g. a placeholder it replaces later).
+        """
         job_id = str(uuid.uuid4())[:8]
+        if ai_summary is None:
+            ai_summary = self.generate_initial_summary(task_spec, cli_type)
 
         job_data: Dict[str, Any] = {
             "job_id": job_id,
             "status": "queued",
             "task_spec": task_spec,
-            "ai_summary": self._generate_initial_summary(task_spec, cli_type),
+            "ai_summary": ai_summary,
             "branch_name": branch_name,
             "base_branch": base_branch,
             "base_image": base_image,
@@ -195,7 +203,7 @@ class JobManager:
 
         return job_id
 
-    def _generate_initial_summary(
+    def generate_initial_summary(
         self, task_spec: str, cli_type: str = "claude"
     ) -> str:
         """Generate AI summary of the task"""
@@ -213,11 +221,8 @@ Return only the 5-word title, nothing else."""
 
             # Use specified CLI to generate summary
             ai_cli = AICliInterface(cli_type)
-            result = subprocess.run(
-                [ai_cli.config["command"], ai_cli.config["print_flag"], summary_prompt],
-                capture_output=True,
-                text=True,
-                timeout=self.DOCKER_INSPECT_TIMEOUT,
+            result = ai_cli.run_prompt(
+                summary_prompt, timeout=self.DOCKER_INSPECT_TIMEOUT
             )
 
             if result.returncode == 0 and result.stdout.strip():
@@ -240,23 +245,19 @@ Return only the 5-word title, nothing else."""
         except OSError as e:
             print(f"ℹ️ Could not execute {cli_type} command: {e}, using fallback")
 
-        # Fallback: Extract key words from first line
+        return self.fallback_summary(task_spec)
+
+    def fallback_summary(self, task_spec: str) -> str:
+        """Summarize a task from the key words of its first line"""
         first_line = task_spec.strip().split("\n")[0] if task_spec.strip() else ""
         words = first_line.split()[:5]
 
         return " ".join(words) if words else "Task processing..."
 
-    def update_job_status(
-        self,
-        job_id: str,
-        status: str,
-        container_id: Optional[str] = None,
-        agent_image: Optional[str] = None,
-        progress_message: Optional[str] = None,
-        error_message: Optional[str] = None,
-        pr_url: Optional[str] = None,
+    def _update_job_fields(
+        self, job_id: str, progress_message: Optional[str] = None, **fields: Any
     ) -> bool:
-        """Update job status and metadata"""
+        """Set top-level job fields, and optionally log progress, under the job lock"""
         job_file = self.jobs_dir / f"{job_id}.json"
         if not job_file.exists():
             return False
@@ -267,24 +268,13 @@ Return only the 5-word title, nothing else."""
                 if job_data is None:
                     return False
 
-                job_data["status"] = status
-                job_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-
-                if container_id:
-                    job_data["container_id"] = container_id
-                if agent_image:
-                    job_data["agent_image"] = agent_image
+                now = datetime.now(timezone.utc).isoformat()
+                job_data.update(fields)
+                job_data["updated_at"] = now
                 if progress_message:
                     job_data["progress_log"].append(
-                        {
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "message": progress_message,
-                        }
+                        {"timestamp": now, "message": progress_message}
                     )
-                if error_message:
-                    job_data["error_message"] = error_message
-                if pr_url:
-                    job_data["pr_url"] = pr_url
 
                 # Use atomic write with temporary file and proper cleanup
                 with self._atomic_write(job_file) as temp_file:
@@ -302,6 +292,34 @@ Return only the 5-word title, nothing else."""
             print(f"Error updating job {job_id} - file system error: {e}")
             return False
 
+    def update_job_summary(self, job_id: str, ai_summary: str) -> bool:
+        """Replace the job's AI summary"""
+        return self._update_job_fields(job_id, ai_summary=ai_summary)
+
+    def update_job_status(
+        self,
+        job_id: str,
+        status: str,
+        container_id: Optional[str] = None,
+        agent_image: Optional[str] = None,
+        progress_message: Optional[str] = None,
+        error_message: Optional[str] = None,
+        pr_url: Optional[str] = None,
+    ) -> bool:
+        """Update job status and metadata"""
+        optional_fields = {
+            "container_id": container_id,
+            "agent_image": agent_image,
+            "error_message": error_message,
+            "pr_url": pr_url,
+        }
+        return self._update_job_fields(
+            job_id,
+            progress_message=progress_message,
+            status=status,
+            **{key: value for key, value in optional_fields.items() if value},
+        )
+
     def update_job_cost_info(
         self, job_id: str, cost_info: Dict[str, Any], git_stats: Dict[str, Any]
     ) -> bool:
@@ -450,94 +468,106 @@ Return only the 5-word title, nothing else."""
             print(f"⚠️ Error accessing job {job_id}: {e}")
             return None
 
+    def _inspect_container_states(
+        self, container_ids: List[str], timeout: int
+    ) -> Dict[str, Tuple[str, str]]:
+        """
+        Inspect containers in one docker call, returning name -> (status, exit code).
+        Containers that no longer exist are absent from the result.
+        """
+        result = subprocess.run(
+            ["docker", "inspect", "--format", self.CONTAINER_STATE_FORMAT]
+            + container_ids,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+        # docker exits non-zero if any container is missing but still
+        # prints the ones it found
+        states = {}
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 3:
+                name, status, exit_code = parts
+                states[name.lstrip("/")] = (status, exit_code)
+        return states
+
+    def _apply_container_state(
+        self,
+        job_id: str,
+        current_status: Optional[str],
+        state: Optional[Tuple[str, str]],
+    ) -> bool:
+        """Update a job from its container state; returns True once the job is final"""
+        if state is None:
+            # Container doesn't exist anymore
+            self.update_job_status(
+                job_id,
+                "failed",
+                error_message="Container stopped unexpectedly",
+            )
+            return True
+
+        status, exit_code = state
+        if status == "exited":
+            if exit_code == "0":
+                # Job completed successfully - extract cost data
+                self._extract_and_update_cost_data(job_id)
+                self.update_job_status(job_id, "completed")
+            else:
+                self.update_job_status(
+                    job_id,
+                    "failed",
+                    error_message=f"Container exited with code {exit_code}",
+                )
+            return True
+
+        if status == "running" and current_status != "running":
+            self.update_job_status(job_id, "running")
+        return False
+
     def sync_job_statuses(self) -> None:
         """Sync job statuses with actual container states"""
-        jobs = []
+        # Only check jobs that think they're running/queued
+        active = []
         for job_file in self.jobs_dir.glob("*.json"):
             job_data = self._safe_load_job(job_file)
             if job_data is None:
                 continue
-            jobs.append(job_data)
+            if job_data.get("status") in ["running", "queued"] and job_data.get(
+                "container_id"
+            ):
+                active.append(job_data)
 
-        for job in jobs:
-            job_id = job.get("job_id")
-            container_id = job.get("container_id")
-            current_status = job.get("status")
+        if not active:
+            return
 
-            # Only check jobs that think they're running/queued
-            if current_status in ["running", "queued"] and container_id:
-                try:
-                    # Check if container exists and get its status
-                    result = subprocess.run(
-                        [
-                            "docker",
-                            "inspect",
-                            container_id,
-                            "--format",
-                            "{{.State.Status}}",
-                        ],
-                        capture_output=True,
-                        text=True,
-                        timeout=self.DOCKER_STOP_TIMEOUT,
-                    )
+        try:
+            states = self._inspect_container_states(
+                [job["container_id"] for job in active], self.DOCKER_STOP_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            # Docker command timed out
+            for job in active:
+                self.update_job_status(
+                    job["job_id"],
+                    "failed",
+                    error_message="Docker status check timed out",
+                )
+            return
+        except OSError as e:
+            # Docker not available
+            for job in active:
+                self.update_job_status(
+                    job["job_id"], "failed", error_message=f"Docker unavailable: {e}"
+                )
+            return
 
-                    if result.returncode != 0:
-                        # Container doesn't exist anymore
-                        self.update_job_status(
-                            job_id,
-                            "failed",
-                            error_message="Container stopped unexpectedly",
-                        )
-                    else:
-                        status = result.stdout.strip()
-                        if status == "exited":
-                            # Check exit code
-                            exit_result = subprocess.run(
-                                [
-                                    "docker",
-                                    "inspect",
-                                    container_id,
-                                    "--format",
-                                    "{{.State.ExitCode}}",
-                                ],
-                                capture_output=True,
-                                text=True,
-                                timeout=self.DOCKER_STOP_TIMEOUT,
-                            )
-
-                            if (
-                                exit_result.returncode == 0
-                                and exit_result.stdout.strip() == "0"
-                            ):
-                                # Job completed successfully
-                                self._extract_and_update_cost_data(job_id)
-                                self.update_job_status(job_id, "completed")
-                            else:
-                                self.update_job_status(
-                                    job_id,
-                                    "failed",
-                                    error_message=f"Container exited with code {exit_result.stdout.strip()}",
-                                )
-                        elif status == "running" and current_status == "queued":
-                            self.update_job_status(job_id, "running")
-
-                except subprocess.CalledProcessError as e:
-                    # Docker command failed
-                    self.update_job_status(
-                        job_id,
-                        "failed",
-                        error_message=f"Docker status check failed: {e.stderr or e}",
-                    )
-                except subprocess.TimeoutExpired:
-                    # Docker command timed out
-                    self.update_job_status(
-                        job_id, "failed", error_message="Docker status check timed out"
-                    )
-                except OSError as e:
-                    # Docker not available
-                    self.update_job_status(
-                        job_id, "failed", error_message=f"Docker unavailable: {e}"
-                    )
+        for job in active:
+            self._apply_container_state(
+                job["job_id"], job["status"], states.get(job["container_id"])
+            )
 
     def list_jobs(self, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all jobs, optionally filtered by status"""
@@ -634,102 +664,23 @@ Return only the 5-word title, nothing else."""
 
         return cleaned
 
-    def get_container_logs(self, job_id: str) -> Optional[str]:
-        """Get Docker container logs for a job"""
-        job_data = self.get_job(job_id)
-        if not job_data or not job_data.get("container_id"):
-            return None
-
-        try:
-            result = subprocess.run(
-                ["docker", "logs", job_data["container_id"]],
-                capture_output=True,
-                text=True,
-                timeout=self.GIT_STATS_TIMEOUT,
-            )
-
-            return result.stdout + result.stderr
-        except subprocess.CalledProcessError as e:
-            return f"Error getting logs - Docker command failed: {e.stderr or e}"
-        except subprocess.TimeoutExpired:
-            return "Error getting logs - operation timed out"
-        except OSError as e:
-            return f"Error getting logs - Docker not available: {e}"
-        except KeyError:
-            return "Error getting logs - job missing container ID"
-
     def monitor_job(self, job_id: str, container_id: str):
         """Monitor job progress in background thread"""
 
         def monitor():
             while True:
                 try:
-                    # Check container status
-                    result = subprocess.run(
-                        [
-                            "docker",
-                            "inspect",
-                            container_id,
-                            "--format",
-                            "{{.State.Status}}",
-                        ],
-                        capture_output=True,
-                        text=True,
-                        timeout=self.DOCKER_STOP_TIMEOUT,
+                    # Check container status and exit code together
+                    states = self._inspect_container_states(
+                        [container_id], self.DOCKER_STOP_TIMEOUT
                     )
-
-                    if result.returncode != 0:
-                        # Container doesn't exist anymore
-                        self.update_job_status(
-                            job_id,
-                            "failed",
-                            error_message="Container stopped unexpectedly",
-                        )
+                    if self._apply_container_state(
+                        job_id, None, states.get(container_id)
+                    ):
                         break
 
-                    status = result.stdout.strip()
-
-                    if status == "exited":
-                        # Check exit code
-                        exit_result = subprocess.run(
-                            [
-                                "docker",
-                                "inspect",
-                                container_id,
-                                "--format",
-                                "{{.State.ExitCode}}",
-                            ],
-                            capture_output=True,
-                            text=True,
-                            timeout=self.DOCKER_STOP_TIMEOUT,
-                        )
-
-                        if (
-                            exit_result.returncode == 0
-                            and exit_result.stdout.strip() == "0"
-                        ):
-                            # Job completed successfully - extract cost data
-                            self._extract_and_update_cost_data(job_id)
-                            self.update_job_status(job_id, "completed")
-                        else:
-                            self.update_job_status(
-                                job_id,
-                                "failed",
-                                error_message=f"Container exited with code {exit_result.stdout.strip()}",
-                            )
-                        break
-
-                    elif status == "running":
-                        self.update_job_status(job_id, "running")
-
                     time.sleep(10)  # Check every 10 seconds (faster monitoring)
 
-                except subprocess.CalledProcessError as e:
-                    self.update_job_status(
-                        job_id,
-                        "failed",
-                        error_message=f"Docker monitoring failed: {e.stderr or e}",
-                    )
                 except subprocess.TimeoutExpired:
                     self.update_job_status(
                         job_id, "failed", error_message="Docker monitoring timed out"
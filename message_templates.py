@@ -203,10 +203,12 @@ Focus on the most recent comments mentioning @claude for current tasks.
         cost_section = ""
         if cost_info:
             cost_lines = []
-            if cost_info.get("total_cost", 0) > 0:
-                cost_lines.append(f"💰 **Cost**: ${cost_info['total_cost']:.4f}")
-            if cost_info.get("total_tokens", 0) > 0:
-                cost_lines.append(f"🔤 **Tokens**: {cost_info['total_tokens']:,}")
+            total_cost = cost_info.get("total_cost", 0)
+            total_tokens = cost_info.get("total_tokens", 0)
+            if total_cost > 0:
+                cost_lines.append(f"💰 **Cost**: ${total_cost:.4f}")
+            if total_tokens > 0:
+                cost_lines.append(f"🔤 **Tokens**: {total_tokens:,}")
             if cost_lines:
                 cost_section = "\n" + "\n".join(cost_lines)
 
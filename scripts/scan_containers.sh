@@ -26,6 +26,15 @@ if ! command -v trivy &> /dev/null; then
     fi
 fi
 
+# Scan an image once into a JSON report, then render the HIGH/CRITICAL table
+# from that report; older trivy releases without `convert` scan a second time
+scan_image() {
+    local image="$1" report="$2"
+    trivy image --format json --output "$report" "$image" || true
+    trivy convert --format table --severity HIGH,CRITICAL "$report" 2>/dev/null \
+        || trivy image --severity HIGH,CRITICAL "$image"
+}
+
 echo "🔍 Scanning Dockerfile for vulnerabilities..."
 if [ -f "Dockerfile" ]; then
     trivy config --format json --output dockerfile-scan.json Dockerfile || true
@@ -37,21 +46,18 @@ fi
 echo
 echo "🖼️  Scanning common base images..."
 echo "Scanning python:3.11 (common base image):"
-trivy image --format json --output python-base-scan.json python:3.11 || true
-trivy image --severity HIGH,CRITICAL python:3.11
+scan_image python:3.11 python-base-scan.json
 
 echo
 echo "🖼️  Scanning pytorch/pytorch:latest (ML base image):"
-trivy image --format json --output pytorch-base-scan.json pytorch/pytorch:latest || true
-trivy image --severity HIGH,CRITICAL pytorch/pytorch:latest
+scan_image pytorch/pytorch:latest pytorch-base-scan.json
 
 # Scan any locally built Claude Agent images
 echo
 echo "🖼️  Scanning locally built Claude Agent images..."
 for image in $(docker images --format "{{.Repository}}:{{.Tag}}" | grep claude-agent || true); do
     echo "Scanning $image:"
-    trivy image --format json --output "${image//\//-}-scan.json" "$image" || true
-    trivy image --severity HIGH,CRITICAL "$image"
+    scan_image "$image" "${image//\//-}-scan.json"
 done
 
 echo
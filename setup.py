@@ -51,6 +51,9 @@ setup(
             "bandit>=1.7.0",
             "safety>=2.0.0",
         ],
+        "docker": [
+            "docker>=6.0.0",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "flake8>=3.8.0",
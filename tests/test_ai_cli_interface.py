@@ -9,7 +9,10 @@ Usage:
 
 from ai_cli_interface import AICliInterface
 import os
+import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
 
 # Add parent directory to import modules
@@ -106,6 +109,74 @@ def test_language_config():
     return True
 
 
+def test_project_language_detection():
+    """Test project language detection from manifests and file counts"""
+    print("\n=== Testing Project Language Detection ===")
+
+    ai_cli = AICliInterface()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "Cargo.toml").write_text("[package]\n")
+        (root / "src").mkdir()
+        (root / "src" / "main.rs").write_text("fn main() {}\n")
+        (root / "scripts").mkdir()
+        for i in range(5):
+            (root / "scripts" / f"tool{i}.py").write_text("pass\n")
+        assert ai_cli.detect_project_language(temp_dir) == "rust"
+        assert not ai_cli._project_scan_cache, "Decisive manifest should skip tree walk"
+        print("✅ Root manifest decides language")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "package.json").write_text("{}\n")
+        (root / "requirements.txt").write_text("flask\n")
+        (root / "web").mkdir()
+        (root / "web" / "package.json").write_text("{}\n")
+        for i in range(4):
+            (root / f"service{i}.py").write_text("pass\n")
+        assert ai_cli.detect_project_language(temp_dir) == "python"
+        print("✅ Mixed root manifests fall back to file counts")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "app").mkdir()
+        for i in range(3):
+            (root / "app" / f"module{i}.py").write_text("pass\n")
+        (root / "node_modules").mkdir()
+        for i in range(10):
+            (root / "node_modules" / f"dep{i}.js").write_text("\n")
+        assert ai_cli.detect_project_language(temp_dir) == "python"
+        print("✅ Pruned directories are ignored when counting files")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert ai_cli.detect_project_language(temp_dir) == "unknown"
+        print("✅ Empty project reports unknown language")
+
+    return True
+
+
+def test_multistage_template():
+    """Test multi-stage outlines are only produced for compiled languages"""
+    print("\n=== Testing Multi-stage Dockerfile Outline ===")
+
+    ai_cli = AICliInterface()
+
+    rust_outline = ai_cli._multistage_template("rust")
+    assert "AS builder" in rust_outline
+    assert "COPY --from=builder" in rust_outline
+    print("✅ Rust gets builder and runtime stages")
+
+    go_outline = ai_cli._multistage_template("go", base_image="golang:1.23")
+    assert go_outline.startswith("FROM golang:1.23 AS builder")
+    print("✅ Explicit base image is used for the builder stage")
+
+    assert ai_cli._multistage_template("python") is None
+    print("✅ Interpreted languages stay single-stage")
+
+    return True
+
+
 def test_cost_estimation_simple():
     """Test cost estimation with simple task"""
     print("\n=== Testing Cost Estimation (Simple Task) ===")
@@ -232,6 +303,94 @@ def test_print_cost_estimate():
     return True
 
 
+def test_estimate_and_check_concurrent():
+    """Test that cost estimation and quality check overlap"""
+    print("\n=== Testing Concurrent Estimate and Quality Check ===")
+
+    ai_cli = AICliInterface()
+
+    def slow_estimate(task_content, language="python"):
+        time.sleep(0.5)
+        return {"estimated_cost_usd": 0.1, "language": language}
+
+    def slow_quality(short_description):
+        time.sleep(0.5)
+        return {"is_clear": True, "clarity_score": 9}
+
+    ai_cli.estimate_task_cost = slow_estimate
+    ai_cli.check_short_description_quality = slow_quality
+
+    start = time.monotonic()
+    estimate, quality = ai_cli.estimate_and_check("Fix typo", "Fix typo", "rust")
+    elapsed = time.monotonic() - start
+
+    assert estimate["language"] == "rust", f"Unexpected estimate: {estimate}"
+    assert quality["is_clear"], f"Unexpected quality: {quality}"
+    assert elapsed < 0.9, f"Calls did not overlap ({elapsed:.2f}s)"
+
+    print(f"✅ Both checks completed in {elapsed:.2f}s")
+    return True
+
+
+def test_response_cache():
+    """Test that identical prompts are answered from the disk cache"""
+    print("\n=== Testing Response Cache ===")
+
+    ai_cli = AICliInterface()
+    calls = []
+
+    def fake_run_prompt(prompt, timeout=None):
+        calls.append(prompt)
+        return subprocess.CompletedProcess(
+            [], 0, stdout='{"is_clear": true, "clarity_score": 8}', stderr=""
+        )
+
+    ai_cli.run_prompt = fake_run_prompt
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ai_cli.RESPONSE_CACHE_DIR = Path(cache_dir)
+
+        first = ai_cli.check_short_description_quality("Fix the login typo")
+        second = ai_cli.check_short_description_quality("Fix the login typo")
+        assert first == second, "Cached response differs from original"
+        assert len(calls) == 1, f"Expected 1 CLI call, got {len(calls)}"
+
+        ai_cli.check_short_description_quality("Fix the signup typo")
+        assert len(calls) == 2, "Different prompt should not hit the cache"
+
+    print("✅ Repeated prompts served from cache")
+    return True
+
+
+def test_nested_json_extraction():
+    """Test that nested estimate JSON is parsed out of surrounding prose"""
+    print("\n=== Testing Nested JSON Extraction ===")
+
+    ai_cli = AICliInterface()
+    output = (
+        "Here is the estimate {not json}:\n"
+        '{"complexity": "medium", "estimated_total_cost": 0.05, '
+        '"cost_factors": ["tests", "docs"], "breakdown": {"input": 0.03}}\n'
+        "Let me know if you need more detail."
+    )
+
+    def fake_run_prompt(prompt, timeout=None):
+        return subprocess.CompletedProcess([], 0, stdout=output, stderr="")
+
+    ai_cli.run_prompt = fake_run_prompt
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ai_cli.RESPONSE_CACHE_DIR = Path(cache_dir)
+        estimate = ai_cli.estimate_task_cost("Add tests", "python")
+
+    assert estimate["complexity"] == "medium", f"Unexpected estimate: {estimate}"
+    assert estimate["cost_factors"] == ["tests", "docs"]
+    assert estimate["breakdown"] == {"input": 0.03}
+
+    print("✅ Nested JSON object extracted")
+    return True
+
+
 def test_error_handling():
     """Test error handling with invalid inputs"""
     print("\n=== Testing Error Handling ===")
@@ -269,10 +428,15 @@ def main():
         ("Initialization", test_initialization),
         ("API Key Detection", test_api_key_detection),
         ("Language Configuration", test_language_config),
+        ("Project Language Detection", test_project_language_detection),
+        ("Multi-stage Dockerfile Outline", test_multistage_template),
         ("Cost Estimation (Simple)", test_cost_estimation_simple),
         ("Cost Estimation (Complex)", test_cost_estimation_complex),
         ("Cost Estimation (Languages)", test_cost_estimation_different_languages),
         ("Print Cost Estimate", test_print_cost_estimate),
+        ("Concurrent Estimate and Check", test_estimate_and_check_concurrent),
+        ("Response Cache", test_response_cache),
+        ("Nested JSON Extraction", test_nested_json_extraction),
         ("Error Handling", test_error_handling),
     ]
 
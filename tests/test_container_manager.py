@@ -8,7 +8,7 @@ Usage:
 """
 
 from input_validator import InputValidator
-from container_manager import ContainerManager
+from container_manager import ContainerManager, _parse_volume_spec
 import os
 import subprocess
 import sys
@@ -80,6 +80,46 @@ def test_dockerfile_generation():
     return True
 
 
+def test_dockerfile_layer_order():
+    """Test that stable install layers come before frequently edited files"""
+    print("\n=== Testing Dockerfile Layer Order ===")
+
+    cm = ContainerManager()
+    dockerfile = cm.generate_agent_dockerfile("ubuntu:22.04")
+
+    markers = [
+        "# Install GitHub CLI",
+        "# Install AI CLI",
+        "COPY security-requirements.txt",
+        "COPY container/bin/ai-security-scan",
+        "COPY container/ /usr/local/container/",
+    ]
+    positions = [dockerfile.index(marker) for marker in markers]
+    assert positions == sorted(positions), f"Unexpected layer order: {markers}"
+
+    print("✅ Layers ordered from most to least stable")
+    return True
+
+
+def test_agent_image_tag():
+    """Test that the agent image tag tracks the rendered Dockerfile"""
+    print("\n=== Testing Agent Image Tag ===")
+
+    cm = ContainerManager()
+    tag = cm.agent_image_tag("python:3.11")
+
+    assert tag.startswith("claude-agent-"), f"Unexpected tag: {tag}"
+    assert tag == cm.agent_image_tag("python:3.11"), "Tag should be stable"
+    assert tag != cm.agent_image_tag("python:3.12"), "Base image should change tag"
+    assert tag != cm.agent_image_tag("python:3.11", "gemini")
+
+    cm._dockerfile_cache[("python:3.11", "claude")] += "\nRUN echo changed\n"
+    assert tag != cm.agent_image_tag("python:3.11"), "Template should change tag"
+
+    print(f"✅ Content-addressed tag: {tag}")
+    return True
+
+
 def test_safety_checks():
     """Test input safety validation"""
     print("\n=== Testing Safety Checks ===")
@@ -307,6 +347,36 @@ def test_volume_validation():
     return True
 
 
+def test_volume_spec_parsing():
+    """Test structured parsing of --volume values"""
+    print("\n=== Testing Volume Spec Parsing ===")
+
+    assert _parse_volume_spec("/data:/workspace/data") == (
+        "/data",
+        "/workspace/data",
+        "rw",
+    )
+    assert _parse_volume_spec("/data:/workspace/data:ro") == (
+        "/data",
+        "/workspace/data",
+        "ro",
+    )
+    assert _parse_volume_spec("C:\\data:/data:ro") == ("C:\\data", "/data", "ro")
+    print("✅ Valid specs split into host, container and options")
+
+    for spec in [
+        "no-colon-separator",
+        ":/no-host-path",
+        "/data:relative/path",
+        "/data:/workspace:ro:extra",
+        "/data:/workspace:",
+    ]:
+        assert _parse_volume_spec(spec) is None, f"Should reject: {spec}"
+    print("✅ Malformed specs rejected before any path checks")
+
+    return True
+
+
 def main():
     """Run all tests"""
     print("🚀 Testing Container Manager")
@@ -320,9 +390,12 @@ def main():
     tests = [
         ("Initialization", test_initialization),
         ("Dockerfile Generation", test_dockerfile_generation),
+        ("Dockerfile Layer Order", test_dockerfile_layer_order),
+        ("Agent Image Tag", test_agent_image_tag),
         ("Safety Checks", test_safety_checks),
         ("Temp Credential Files", test_temp_credential_files),
         ("Volume Validation", test_volume_validation),
+        ("Volume Spec Parsing", test_volume_spec_parsing),
         ("Build Lightweight Image", test_build_lightweight_image),
         ("Container Execution Setup", test_container_execution_dry_run),
     ]
@@ -4,6 +4,7 @@ Automated Test Script for input_validator.py - Pure validation logic testing
 """
 
 from input_validator import InputValidator
+import argparse
 import sys
 import tempfile
 from pathlib import Path
@@ -306,6 +307,13 @@ def test_spec_safety_validation():
             print(f"❌ Should have flagged: {spec[:30]}...")
             return False
 
+    # Overlapping matches are all reported
+    concerns = validator.validate_spec_safety("Expose the password in the db")
+    if len(concerns) != 2:
+        print(f"❌ Expected password and expose/db concerns, got: {concerns}")
+        return False
+    print("✅ Flagged overlapping concerns")
+
     # Should not flag normal specs
     safe_specs = [
         "Fix the login function",
@@ -353,6 +361,49 @@ def test_mount_path_validation():
     return True
 
 
+def test_validate_inputs():
+    """Test that validate_inputs returns sanitized values without mutating args"""
+    print("\n=== Testing run input validation ===")
+    validator = InputValidator()
+
+    args = argparse.Namespace(
+        spec=None,
+        issue=" https://github.com/owner/repo/issues/42 ",
+        pr=None,
+        branch="fix/issue-42",
+        base_image="Python:3.11",
+    )
+    inputs = validator.validate_inputs(args)
+    if not inputs:
+        print("❌ Should accept valid issue inputs")
+        return False
+    assert inputs.issue_url == "https://github.com/owner/repo/issues/42"
+    assert inputs.base_image == "python:3.11"
+    assert inputs.branch == "fix/issue-42"
+    assert args.base_image == "Python:3.11", "args should not be mutated"
+    print(f"✅ Validated inputs: {inputs}")
+
+    args.branch = "bad..branch"
+    if validator.validate_inputs(args) is not None:
+        print("❌ Should reject invalid branch")
+        return False
+    print("✅ Correctly rejected invalid branch")
+
+    # --short is a task source and may be combined with an issue, not with --spec
+    args.branch = "fix/issue-42"
+    args.short = "Fix login bug"
+    if validator.validate_inputs(args) is None:
+        print("❌ Should accept --short with an issue")
+        return False
+    args.spec = "task.md"
+    if validator.validate_inputs(args) is not None:
+        print("❌ Should reject --spec together with --short")
+        return False
+    print("✅ --short handled as a task source")
+
+    return True
+
+
 def main():
     """Run all validation tests"""
     print("🚀 Running Input Validator Tests")
@@ -367,6 +418,7 @@ def main():
         ("Task Spec Validation", test_task_spec_validation),
         ("Spec Safety Validation", test_spec_safety_validation),
         ("Mount Path Validation", test_mount_path_validation),
+        ("Run Input Validation", test_validate_inputs),
     ]
 
     passed = 0
@@ -228,6 +228,40 @@ def test_cost_info_updates():
         shutil.rmtree(temp_dir)
 
 
+def test_summary_updates():
+    """Test placeholder summaries replaced by a later AI summary"""
+    print("\n=== Testing Summary Updates ===")
+
+    jm, temp_dir = setup_test_job_manager()
+
+    try:
+        task_spec = "Add OAuth login with JWT tokens\nMore details here"
+        placeholder = jm.fallback_summary(task_spec)
+        assert placeholder == "Add OAuth login with JWT"
+
+        job_id = jm.create_job(
+            task_spec=task_spec,
+            base_image="python:3.11",
+            branch_name="summary-test",
+            base_branch="main",
+            ai_summary=placeholder,
+        )
+        assert jm.get_job(job_id)["ai_summary"] == placeholder
+        print("✅ Job created with caller-provided summary")
+
+        assert jm.update_job_summary(job_id, "Implement OAuth JWT login")
+        assert jm.get_job(job_id)["ai_summary"] == "Implement OAuth JWT login"
+        assert not jm.update_job_summary("missing", "Nothing")
+        print("✅ Summary replaced once generated")
+
+        return True
+
+    finally:
+        import shutil
+
+        shutil.rmtree(temp_dir)
+
+
 def test_job_listing_and_filtering():
     """Test job listing and status filtering"""
     print("\n=== Testing Job Listing ===")
@@ -281,6 +315,52 @@ def test_job_listing_and_filtering():
         shutil.rmtree(temp_dir)
 
 
+def test_sync_job_statuses():
+    """Test that active jobs are synced from one batched container inspect"""
+    print("\n=== Testing Job Status Sync ===")
+
+    jm, temp_dir = setup_test_job_manager()
+
+    try:
+        job_ids = [
+            jm.create_job(f"Task {i}", "python:3.11", f"branch{i}", "main")
+            for i in range(4)
+        ]
+        for i, job_id in enumerate(job_ids):
+            jm.update_job_status(job_id, "queued", container_id=f"claude-agent-{i}")
+
+        calls = []
+
+        def fake_inspect(container_ids, timeout):
+            calls.append(list(container_ids))
+            return {
+                "claude-agent-0": ("running", "0"),
+                "claude-agent-1": ("exited", "0"),
+                "claude-agent-2": ("exited", "1"),
+            }
+
+        jm._inspect_container_states = fake_inspect
+        jm._extract_and_update_cost_data = lambda job_id: None
+        jm.sync_job_statuses()
+
+        assert len(calls) == 1, f"Expected one inspect call, got {len(calls)}"
+        assert sorted(calls[0]) == [f"claude-agent-{i}" for i in range(4)]
+        print("✅ All active containers inspected in one call")
+
+        statuses = [jm.get_job(job_id)["status"] for job_id in job_ids]
+        assert statuses == ["running", "completed", "failed", "failed"], statuses
+        assert "code 1" in jm.get_job(job_ids[2])["error_message"]
+        assert "unexpectedly" in jm.get_job(job_ids[3])["error_message"]
+        print("✅ Job statuses follow container state")
+
+        return True
+
+    finally:
+        import shutil
+
+        shutil.rmtree(temp_dir)
+
+
 def test_file_locking_and_atomic_operations():
     """Test file locking and atomic write operations"""
     print("\n=== Testing File Operations ===")
@@ -545,7 +625,9 @@ def main():
         ("Job Creation", test_job_creation),
         ("Status Updates", test_job_status_updates),
         ("Cost Info Updates", test_cost_info_updates),
+        ("Summary Updates", test_summary_updates),
         ("Job Listing", test_job_listing_and_filtering),
+        ("Job Status Sync", test_sync_job_statuses),
         ("File Operations", test_file_locking_and_atomic_operations),
         ("Data Validation", test_data_validation),
         ("Job Cleanup", test_job_cleanup),
@@ -8,9 +8,9 @@ Usage: python3 tests/test_ui_utilities.py
 from ui_utilities import UIUtilities
 import io
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 # Add parent directory to import modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -171,6 +171,11 @@ def test_timestamp_formatting():
     assert "h ago" in result
     print("✅ Hour-old timestamp formatted correctly")
 
+    # Test timestamps slightly ahead of a shared render time
+    ahead = (now + timedelta(minutes=5)).isoformat()
+    assert ui.format_timestamp(ahead, now) == "just now"
+    print("✅ Clock-skewed timestamp is not reported as hours old")
+
     # Test invalid timestamp
     result = ui.format_timestamp("invalid-date")
     assert result == "invalid-date"
@@ -179,6 +184,26 @@ def test_timestamp_formatting():
     return True
 
 
+def test_diff_stat_line_count():
+    """Test line counting from git diff --stat summaries"""
+    print("\n=== Testing Diff Stat Line Count ===")
+
+    job_manager, validator, ai_cli, container_manager = create_mock_dependencies()
+    ui = UIUtilities(job_manager, validator, ai_cli, container_manager)
+
+    stat_output = (
+        " auth.py  |  9 +++++++--\n"
+        " tests.py |  4 ++++\n"
+        " 2 files changed, 11 insertions(+), 2 deletions(-)\n"
+    )
+    assert ui._count_lines_from_stat(stat_output) == 13
+    assert ui._count_lines_from_stat(" 1 file changed, 1 insertion(+)") == 1
+    assert ui._count_lines_from_stat("") == 0
+    print("✅ Insertions and deletions counted from summary line")
+
+    return True
+
+
 def test_status_coloring():
     """Test status color formatting"""
     print("\n=== Testing Status Coloring ===")
@@ -308,12 +333,18 @@ def test_logs_display_mock():
     # Mock job and logs
     sample_jobs = create_sample_jobs()
     job_manager.get_job.return_value = sample_jobs[0]
-    job_manager.get_container_logs.return_value = (
-        "Sample container logs\nLine 1\nLine 2\nCompleted successfully"
+    process = Mock()
+    process.stdout = io.StringIO(
+        "Sample container logs\nLine 1\nLine 2\nCompleted successfully\n"
     )
 
     # Test non-follow logs
-    output = capture_output(ui.show_logs, job_id="abc12345", follow=False)
+    with patch("ui_utilities.subprocess.Popen", return_value=process) as popen:
+        output = capture_output(ui.show_logs, job_id="abc12345", follow=False)
+
+    cmd = popen.call_args[0][0]
+    assert cmd == ["docker", "logs", "--tail", "500", "container_123"], cmd
+    print("✅ Logs requested with a tail limit")
 
     print("Logs output preview:")
     print("-" * 40)
@@ -418,6 +449,7 @@ def main():
     tests = [
         ("Initialization", test_initialization),
         ("Timestamp Formatting", test_timestamp_formatting),
+        ("Diff Stat Line Count", test_diff_stat_line_count),
         ("Status Coloring", test_status_coloring),
         ("Job List Display", test_job_list_display),
         ("Detailed Job Display", test_detailed_job_display),
@@ -4,22 +4,44 @@ Claude Agent Worker - Autonomous GitHub Issue/Spec Processor
 """
 
 import argparse
+import dataclasses
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from ai_cli_interface import AICliInterface
 from cli_parser import CLIParser
 from container_manager import ContainerManager
 from github_utils import GitHubUtils
-from input_validator import InputValidator
-from job_manager import JobManager
+from input_validator import InputValidator, ValidatedJobInputs
 from ui_utilities import UIUtilities
 
+if TYPE_CHECKING:
+    from job_manager import JobManager
+
 
 class ClaudeAgent:
+    __slots__ = (
+        "reviewer_username",
+        "max_lines",
+        "warn_lines",
+        "validator",
+        "ai_cli",
+        "container_manager",
+        "github_utils",
+        "config",
+        "cli_parser",
+        "_job_manager",
+        "_ui",
+    )
+
+    # Specs larger than this are rejected before being read into a prompt
+    MAX_SPEC_BYTES = 1024 * 1024
+
     def __init__(
         self,
         reviewer_username: str = "vikranth22446",
@@ -29,29 +51,47 @@ class ClaudeAgent:
         self.reviewer_username = reviewer_username
         self.max_lines = max_lines
         self.warn_lines = warn_lines
-        self.job_manager = JobManager()
         self.validator = InputValidator()
         self.ai_cli = AICliInterface()
         self.container_manager = ContainerManager(self.validator)
         self.github_utils = GitHubUtils(reviewer_username)
-        self.ui = UIUtilities(
-            self.job_manager, self.validator, self.ai_cli, self.container_manager
-        )
+        # Built on first use; gen-dockerfile and help never touch job state
+        self._job_manager: Optional["JobManager"] = None
+        self._ui: Optional[UIUtilities] = None
 
         self.config = self._load_config()
         self.cli_parser = CLIParser(reviewer_username, self.config)
 
+    @property
+    def job_manager(self) -> "JobManager":
+        """Job state store, imported and created on first access"""
+        if self._job_manager is None:
+            from job_manager import JobManager
+
+            self._job_manager = JobManager()
+        return self._job_manager
+
+    @property
+    def ui(self) -> UIUtilities:
+        """Command UI, created on first access"""
+        if self._ui is None:
+            self._ui = UIUtilities(
+                self.job_manager, self.validator, self.ai_cli, self.container_manager
+            )
+        return self._ui
+
     def parse_args(self) -> argparse.Namespace:
         """Parse command line arguments"""
         return self.cli_parser.parse_args()
 
-    def run(self) -> None:
-        """Main execution flow"""
-        args = self.parse_args()
+    def run(self, args: Optional[argparse.Namespace] = None) -> None:
+        """Main execution flow, parsing the command line unless args are given"""
+        if args is None:
+            args = self.parse_args()
 
         if args.command is None:
             # Show help text when no command is provided
-            self.cli_parser._parser.print_help()
+            self.cli_parser.print_help()
             sys.exit(0)
         elif args.command == "run":
             self.run_daemon_mode(args)
@@ -62,7 +102,7 @@ class ClaudeAgent:
         elif args.command == "summary":
             self.ui.show_summary(args.job_id)
         elif args.command == "logs":
-            self.ui.show_logs(args.job_id, args.follow)
+            self.ui.show_logs(args.job_id, args.follow, args.tail)
         elif args.command == "cleanup":
             self.ui.cleanup_jobs(args.job_id, args.all, args.force)
         elif args.command == "kill":
@@ -109,8 +149,18 @@ class ClaudeAgent:
     def read_spec_file(self, spec_path: str) -> str:
         """Read markdown specification file"""
         try:
-            with open(spec_path, "r") as f:
-                return f.read()
+            # One bounded read: at most one byte past the cap is ever loaded,
+            # even if the file grows while we read it
+            with open(spec_path, "rb") as f:
+                data = f.read(self.MAX_SPEC_BYTES + 1)
+            if len(data) > self.MAX_SPEC_BYTES:
+                print(
+                    f"❌ Error: Spec file too large "
+                    f"(max: {self.MAX_SPEC_BYTES} bytes)"
+                )
+                return ""
+            # Decode once; skips text-mode newline translation
+            return data.decode("utf-8", errors="replace")
         except Exception as e:
             print(f"❌ Error reading spec file: {e}")
             return ""
@@ -181,42 +231,61 @@ Please review the changes and test as appropriate for your workflow.
         # Create CLI interface for the specified type
         self.ai_cli = AICliInterface(args.cli_type)
 
+        # Validated once; everything below uses these values, not raw args
+        inputs = self.validator.validate_inputs(args)
+        if inputs is None:
+            sys.exit(1)
+
         spec_content = ""
         issue_title = ""
         issue_body = ""
         issue_number = None
 
-        # Validate spec/short arguments
-        if args.spec and args.short:
-            print("❌ Error: Cannot specify both --spec and --short. Choose one.")
-            sys.exit(1)
-
-        if args.spec:
-            spec_content = self.read_spec_file(args.spec)
-        elif args.short:
-            spec_content = self.handle_short_description(args.short)
-
-        if args.issue:
-            issue_number = args.issue.split("/")[-1]
-            issue_data = self.github_utils.get_issue(issue_number)
-            issue_title = issue_data.get("title", "") if issue_data else ""
-            issue_body = issue_data.get("body", "") if issue_data else ""
-
-        if args.pr:
-            task_spec = self.github_utils.extract_claude_tasks_from_pr(args.pr)
-            pr_data = self.github_utils.get_pr(args.pr)
-            if pr_data and pr_data.get("headRefName"):
-                args.branch = pr_data["headRefName"]
-                print(f"📋 Using existing PR branch: {args.branch}")
+        # gh lookups are network-bound; run them while the spec is read locally
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            if inputs.issue_url:
+                issue_number = inputs.issue_url.rpartition("/")[2]
+                issue_future = pool.submit(self.github_utils.get_issue, issue_number)
+            if inputs.pr_number:
+                pr_tasks_future = pool.submit(
+                    self.github_utils.extract_claude_tasks_from_pr, inputs.pr_number
+                )
+                pr_future = pool.submit(self.github_utils.get_pr, inputs.pr_number)
+
+            if inputs.spec_path:
+                spec_content = self.read_spec_file(str(inputs.spec_path))
+            elif args.short:
+                spec_content = self.handle_short_description(args.short)
+
+            if inputs.issue_url:
+                issue_data = issue_future.result()
+                issue_title = issue_data.get("title", "") if issue_data else ""
+                issue_body = issue_data.get("body", "") if issue_data else ""
+
+            if inputs.pr_number:
+                task_spec = pr_tasks_future.result()
+                pr_data = pr_future.result()
+                if not (pr_data and pr_data.get("headRefName")):
+                    print(
+                        f"❌ Error: Could not determine branch for PR #{inputs.pr_number}"
+                    )
+                    return
+                try:
+                    pr_branch = self.validator.sanitize_branch_name(
+                        pr_data["headRefName"]
+                    )
+                except ValueError as e:
+                    print(f"❌ Error: {e}")
+                    return
+                inputs = dataclasses.replace(inputs, branch=pr_branch)
+                print(f"📋 Using existing PR branch: {inputs.branch}")
             else:
-                print(f"❌ Error: Could not determine branch for PR #{args.pr}")
-                return
-            self._current_pr_number = args.pr
-        else:
-            task_spec = self.merge_specifications(spec_content, issue_title, issue_body)
+                task_spec = self.merge_specifications(
+                    spec_content, issue_title, issue_body
+                )
 
         if args.cost_estimate:
-            task_type = "PR continuation" if args.pr else "new task"
+            task_type = "PR continuation" if inputs.pr_number else "new task"
             estimate = self.ai_cli.estimate_task_cost(task_spec, args.language)
             if estimate:
                 self.ai_cli.print_cost_estimate(estimate, f"{task_type} (background job)")
@@ -236,23 +305,36 @@ Please review the changes and test as appropriate for your workflow.
 
             print("🚀 Starting background job...\n")
 
-        job_id = self.job_manager.create_job(
+        # The AI title is a CLI round trip of up to 15s; it runs alongside the
+        # image build and replaces the first-line placeholder once the job is
+        # up. The thread is a daemon so a failed launch exits without it.
+        job_manager = self.job_manager
+        summary: List[str] = []
+        summary_thread = threading.Thread(
+            target=lambda: summary.append(
+                job_manager.generate_initial_summary(task_spec, args.cli_type)
+            ),
+            daemon=True,
+        )
+        summary_thread.start()
+
+        job_id = job_manager.create_job(
             task_spec=task_spec,
-            base_image=args.base_image,
-            branch_name=args.branch,
+            base_image=inputs.base_image,
+            branch_name=inputs.branch,
             base_branch=args.base_branch,
-            github_issue=args.issue,
+            github_issue=inputs.issue_url,
             cli_type=args.cli_type,
+            ai_summary=job_manager.fallback_summary(task_spec),
         )
 
         print(f"🚀 Started background job: {job_id}")
-        print(f"📋 Branch: {args.branch}")
-        print(f"🐳 Base image: {args.base_image}")
+        print(f"📋 Branch: {inputs.branch}")
+        print(f"🐳 Base image: {inputs.base_image}")
 
         success = self.execute_claude_code_daemon(
             task_spec,
-            args.base_image,
-            args.branch,
+            inputs,
             args.base_branch,
             job_id,
             issue_number,
@@ -263,6 +345,11 @@ Please review the changes and test as appropriate for your workflow.
             args.cli_type,
         )
 
+        if success:
+            summary_thread.join()
+            if summary:
+                job_manager.update_job_summary(job_id, summary[0])
+
         if success:
             print(f"✅ Job {job_id} started successfully")
             print(f"💡 Monitor with: toren status --job-id {job_id}")
@@ -277,8 +364,7 @@ Please review the changes and test as appropriate for your workflow.
     def execute_claude_code_daemon(
         self,
         task_spec: str,
-        base_image: str,
-        branch_name: str,
+        inputs: ValidatedJobInputs,
         base_branch: str,
         job_id: str,
         issue_number: Optional[str] = None,
@@ -288,9 +374,14 @@ Please review the changes and test as appropriate for your workflow.
         custom_volumes: Optional[List[str]] = None,
         cli_type: str = "claude",
     ) -> bool:
-        """Execute Claude Code in background daemon mode"""
+        """
+        Execute Claude Code in background daemon mode. `inputs` has already
+        been through InputValidator.validate_inputs, so it is not re-checked.
+        """
         try:
-            agent_image = self.container_manager.build_agent_image(base_image, cli_type)
+            agent_image = self.container_manager.build_agent_image(
+                inputs.base_image, cli_type
+            )
             if not agent_image:
                 return False
 
@@ -299,7 +390,7 @@ Please review the changes and test as appropriate for your workflow.
 
             container_process = self.container_manager.execute_in_container(
                 agent_image,
-                branch_name,
+                inputs.branch,
                 task_spec,
                 github_token,
                 anthropic_api_key,
@@ -337,6 +428,21 @@ Please review the changes and test as appropriate for your workflow.
             print("❌ Error: AI API key not found. Please set ANTHROPIC_API_KEY environment variable.")
             sys.exit(1)
         
+        # Confirm overwrite before spending an AI call on generation
+        output_path = Path(args.output)
+        if output_path.exists() and not args.force:
+            if not sys.stdin.isatty():
+                print(
+                    f"❌ Error: {args.output} already exists. Use --force to overwrite."
+                )
+                sys.exit(1)
+            response = input(
+                f"⚠️  File {args.output} already exists. Overwrite? [y/N]: "
+            ).lower()
+            if response != "y":
+                print("⏹️  Operation cancelled")
+                sys.exit(0)
+
         # Generate the Dockerfile content
         dockerfile_content = self.ai_cli.generate_dockerfile(
             project_path=os.getcwd(),
@@ -348,24 +454,20 @@ Please review the changes and test as appropriate for your workflow.
             sys.exit(1)
         
         # Write the Dockerfile to the specified output location
-        output_path = Path(args.output)
-        
         try:
             # Create directory if it doesn't exist
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Check if file exists and ask for confirmation
-            if output_path.exists():
-                response = input(f"⚠️  File {args.output} already exists. Overwrite? [y/N]: ").lower()
-                if response != "y":
-                    print("⏹️  Operation cancelled")
-                    sys.exit(0)
-            
             # Write the Dockerfile
             with open(output_path, 'w') as f:
                 f.write(dockerfile_content)
             
             print(f"✅ Dockerfile successfully generated at: {args.output}")
+
+            dockerignore_path = Path(os.getcwd()) / ".dockerignore"
+            if not dockerignore_path.exists():
+                dockerignore_path.write_text(self.ai_cli.generate_dockerignore())
+                print(f"✅ Build context exclusions written to: {dockerignore_path}")
             
             # Show a preview of the generated content
             lines = dockerfile_content.split('\n')
@@ -394,7 +496,7 @@ def main():
         max_lines=getattr(args, "max_lines", 600),
         warn_lines=getattr(args, "warn_lines", 300),
     )
-    agent.run()
+    agent.run(args)
 
 
 if __name__ == "__main__":
@@ -4,10 +4,27 @@ import re
 import subprocess
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+_STAT_CHANGE_RE = re.compile(r"(\d+) (?:insertion|deletion)")
+# Review verdict; searched case-insensitively instead of upper-casing the review
+_APPROVE_RE = re.compile(r"approve", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def _parse_timestamp(iso_string: str) -> datetime:
+    """Parse a stored ISO timestamp; jobs and progress entries repeat them"""
+    return datetime.fromisoformat(iso_string.replace("Z", "+00:00"))
+
+
+_JOB_LIST_HEADER = f"{'JOB ID':<10} {'STATUS':<12} {'BRANCH':<18} {'COST':<8} {'+/- LINES':<9} {'CREATED':<10} {'SUMMARY'}"
+
 
 class UIUtilities:
+    # Lines of existing output shown by `toren logs` unless --tail says otherwise
+    DEFAULT_LOG_TAIL = "500"
+
     def __init__(self, job_manager, validator, ai_cli, container_manager):
         self.job_manager = job_manager
         self.validator = validator
@@ -17,25 +34,30 @@ class UIUtilities:
     def _count_lines_from_stat(self, stat_output: str) -> int:
         """Extract line count from git diff --stat output"""
         try:
-            for line in stat_output.split("\n"):
-                if "insertions" in line or "deletions" in line:
-                    numbers = re.findall(r"\d+", line)
-                    return sum(int(n) for n in numbers[:2])  # insertions + deletions
+            # The summary is the last line, so only that line is scanned
+            summary = stat_output.rstrip().rpartition("\n")[2]
+            # insertions + deletions; the leading "N files changed" is skipped
+            return sum(int(n) for n in _STAT_CHANGE_RE.findall(summary))
         except (subprocess.SubprocessError, ValueError, OSError):
             pass
         return 0
 
-    def format_timestamp(self, iso_string: str) -> str:
+    def format_timestamp(
+        self, iso_string: str, now: Optional[datetime] = None
+    ) -> str:
+        """Relative age of an ISO timestamp; pass `now` to share it across rows"""
         try:
-            dt = datetime.fromisoformat(iso_string.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
+            dt = _parse_timestamp(iso_string)
+            if now is None:
+                now = datetime.now(timezone.utc)
             diff = now - dt
+            seconds = diff.total_seconds()
             if diff.days > 0:
                 return f"{diff.days}d ago"
-            elif diff.seconds > 3600:
-                return f"{diff.seconds // 3600}h ago"
-            elif diff.seconds > 60:
-                return f"{diff.seconds // 60}m ago"
+            elif seconds > 3600:
+                return f"{int(seconds) // 3600}h ago"
+            elif seconds > 60:
+                return f"{int(seconds) // 60}m ago"
             else:
                 return "just now"
         except (ValueError, TypeError):
@@ -68,27 +90,20 @@ class UIUtilities:
 
     def _show_job_list(self, jobs: List[Dict]) -> None:
         display_jobs = jobs[:10]
-        print(
-            f"{'JOB ID':<10} {'STATUS':<12} {'BRANCH':<18} {'COST':<8} {'+/- LINES':<9} {'CREATED':<10} {'SUMMARY'}"
-        )
-        print("-" * 90)
+        # Rows are collected and written with a single print
+        rows = [_JOB_LIST_HEADER, "-" * 90]
+        format_timestamp = self.format_timestamp
+        now = datetime.now(timezone.utc)
+        status_color = self.status_color
 
         for job in display_jobs:
-            job_id = job["job_id"]
-            status = self.status_color(job["status"])
-            branch = (
-                job["branch_name"][:16] + ".."
-                if len(job["branch_name"]) > 18
-                else job["branch_name"]
-            )
+            branch = job["branch_name"]
+            if len(branch) > 18:
+                branch = branch[:16] + ".."
 
-            cost_info = job.get("cost_info", {})
+            total_cost = job.get("cost_info", {}).get("total_cost", 0)
+            cost_str = f"${total_cost:.3f}" if total_cost > 0 else "-"
             git_stats = job.get("git_stats", {})
-            cost_str = (
-                f"${cost_info.get('total_cost', 0):.3f}"
-                if cost_info.get("total_cost", 0) > 0
-                else "-"
-            )
             lines_added = git_stats.get("lines_added", 0)
             lines_deleted = git_stats.get("lines_deleted", 0)
             lines_str = (
@@ -97,16 +112,15 @@ class UIUtilities:
                 else "-"
             )
 
-            created = self.format_timestamp(job["created_at"])
-            summary = (
-                job["ai_summary"][:35] + "..."
-                if len(job["ai_summary"]) > 35
-                else job["ai_summary"]
-            )
-            print(
-                f"{job_id:<10} {status:<12} {branch:<18} {cost_str:<8} {lines_str:<9} {created:<10} {summary}"
+            summary = job["ai_summary"]
+            if len(summary) > 35:
+                summary = summary[:35] + "..."
+            rows.append(
+                f"{job['job_id']:<10} {status_color(job['status']):<12} {branch:<18} {cost_str:<8} {lines_str:<9} {format_timestamp(job['created_at'], now):<10} {summary}"
             )
 
+        print("\n".join(rows))
+
         if len(jobs) > len(display_jobs):
             print(f"\nShowing {len(display_jobs)} of {len(jobs)} jobs (most recent)")
 
@@ -149,24 +163,23 @@ class UIUtilities:
 
         cost_info = job.get("cost_info", {})
         git_stats = job.get("git_stats", {})
+        total_cost = cost_info.get("total_cost", 0)
+        total_lines = git_stats.get("total_lines_changed", 0)
 
-        if (
-            cost_info.get("total_cost", 0) > 0
-            or git_stats.get("total_lines_changed", 0) > 0
-        ):
+        if total_cost > 0 or total_lines > 0:
             print("\n💰 Session Metrics:")
-            if cost_info.get("total_cost", 0) > 0:
-                print(f"  Cost: ${cost_info.get('total_cost', 0):.4f}")
-                total_tokens = cost_info.get("input_tokens", 0) + cost_info.get(
-                    "output_tokens", 0
-                )
+            if total_cost > 0:
+                print(f"  Cost: ${total_cost:.4f}")
+                input_tokens = cost_info.get("input_tokens", 0)
+                output_tokens = cost_info.get("output_tokens", 0)
+                total_tokens = input_tokens + output_tokens
                 if total_tokens > 0:
                     print(
-                        f"  Tokens: {total_tokens:,} ({cost_info.get('input_tokens', 0):,} input + {cost_info.get('output_tokens', 0):,} output)"
+                        f"  Tokens: {total_tokens:,} ({input_tokens:,} input + {output_tokens:,} output)"
                     )
-            if git_stats.get("total_lines_changed", 0) > 0:
+            if total_lines > 0:
                 print(
-                    f"  Lines changed: +{git_stats.get('lines_added', 0)} -{git_stats.get('lines_deleted', 0)} (total: {git_stats.get('total_lines_changed', 0)})"
+                    f"  Lines changed: +{git_stats.get('lines_added', 0)} -{git_stats.get('lines_deleted', 0)} (total: {total_lines})"
                 )
                 print(f"  Files modified: {git_stats.get('files_changed', 0)}")
 
@@ -175,8 +188,9 @@ class UIUtilities:
 
         if job.get("progress_log"):
             print("\n📈 Progress Log:")
+            now = datetime.now(timezone.utc)
             for entry in job["progress_log"][-5:]:
-                timestamp = self.format_timestamp(entry["timestamp"])
+                timestamp = self.format_timestamp(entry["timestamp"], now)
                 print(f"  [{timestamp}] {entry['message']}")
 
         print("\n📄 Task Specification:")
@@ -204,7 +218,9 @@ class UIUtilities:
                 f"  [{self.format_timestamp(latest['timestamp'])}] {latest['message']}"
             )
 
-    def show_logs(self, job_id: str, follow: bool = False) -> None:
+    def show_logs(
+        self, job_id: str, follow: bool = False, tail: str = DEFAULT_LOG_TAIL
+    ) -> None:
         job = self.job_manager.get_job(job_id)
         if not job:
             print(f"❌ Job {job_id} not found")
@@ -216,16 +232,43 @@ class UIUtilities:
         print(f"📋 Logs for Job {job_id} (Container: {job['container_id']}):")
         print("-" * 60)
 
+        # Lines are echoed as docker produces them, so neither mode holds
+        # more than one line of the log in memory
+        cmd = ["docker", "logs", "--tail", tail]
         if follow:
-            try:
-                process = subprocess.Popen(["docker", "logs", "-f", job["container_id"]])
-                process.wait()
-            except KeyboardInterrupt:
-                process.terminate()
+            cmd.append("-f")
+        cmd.append(job["container_id"])
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as e:
+            print(f"❌ Error getting logs - Docker not available: {e}")
+            return
+        stdout = process.stdout
+        assert stdout is not None  # stdout=PIPE
+
+        wrote_any = False
+        try:
+            for line in stdout:
+                sys.stdout.write(line)
+                wrote_any = True
+            process.wait()
+        except KeyboardInterrupt:
+            process.terminate()
+            if follow:
                 print("\n👋 Log following stopped")
-        else:
-            logs = self.job_manager.get_container_logs(job_id)
-            print(logs if logs else "No logs available")
+            return
+        finally:
+            stdout.close()
+
+        if not wrote_any and not follow:
+            print("No logs available")
 
     def cleanup_jobs(
         self, job_id: Optional[str] = None, cleanup_all: bool = False, force: bool = False
@@ -402,7 +445,7 @@ class UIUtilities:
             # Determine review event type
             # Note: REQUEST_CHANGES requires special permissions, so defaulting to COMMENT
             review_event = "COMMENT"
-            if allow_approve and "APPROVE" in review_content.upper():
+            if allow_approve and _APPROVE_RE.search(review_content):
                 review_event = "APPROVE"
             # Temporarily disable REQUEST_CHANGES due to GitHub API permissions
             # elif "REQUEST_CHANGES" in review_content.upper() or "NEEDS CHANGES" in review_content.upper():